@@ -17,16 +17,11 @@ from app.services.cost_engine.cost_explorer import get_cost_data
 from app.services.governance.encryption_checks import check_encryption
 from app.services.governance.security_group_checks import check_security_groups
 from app.services.governance.tag_validation import validate_tags
-from app.services.rules_engine.ec2_rules import evaluate_ec2_rules
-from app.services.rules_engine.lb_rules import evaluate_lb_rules
-from app.services.rules_engine.nat_rules import evaluate_nat_rules
-from app.services.rules_engine.rds_rules import evaluate_rds_rules
+from app.services.rules_engine import (
+    cloudfront_rules, ec2_rules, iam_rules, lambda_rules, lb_rules,
+    nat_rules, rds_rules, storage_rules, vpc_rules,
+)
 from app.services.rules_engine.scoring import compute_risk_score
-from app.services.rules_engine.storage_rules import evaluate_storage_rules
-from app.services.rules_engine.lambda_rules import evaluate_lambda_rules
-from app.services.rules_engine.iam_rules import evaluate_iam_rules
-from app.services.rules_engine.cloudfront_rules import evaluate_cloudfront_rules, evaluate_cloudwatch_rules
-from app.services.rules_engine.vpc_rules import evaluate_vpc_rules
 from app.services.scanner.ebs_scanner import scan_ebs
 from app.services.scanner.ec2_scanner import scan_ec2
 from app.services.scanner.eip_scanner import scan_eip
@@ -40,6 +35,7 @@ from app.services.scanner.iam_scanner import scan_iam
 from app.services.scanner.cloudfront_scanner import scan_cloudfront
 from app.services.scanner.cloudwatch_scanner import scan_cloudwatch
 from app.services.scanner.vpc_scanner import scan_vpc
+from app.services.scanner.resource import RawData, ScannedResource
 from app.services.scanner.dynamodb_scanner import scan_dynamodb
 from app.services.scanner.elasticache_scanner import scan_elasticache
 from app.services.scanner.route53_scanner import scan_route53
@@ -74,6 +70,33 @@ SCANNERS = {
 # IAM, CloudFront, and Route53 are global — only scan once per run, not per region
 _GLOBAL_SCANNERS = {"IAM", "CloudFront", "Route53"}
 
+# Scan threads: up to 16 per region so each region proceeds concurrently
+# instead of regions queueing behind a fixed pool, with an overall ceiling.
+_SCAN_WORKERS_PER_REGION = 16
+_MAX_SCAN_WORKERS = 64
+
+# Rule engines and the resource types they apply to. Inverted into
+# _RULES_BY_RTYPE at import so each resource only enters the engines that can
+# actually flag it. Types with no entry (DynamoDB, ElastiCache, Route53, ECS)
+# have no dedicated rules yet and are clean by default.
+_RULE_ENGINES = (
+    (ec2_rules.APPLICABLE_TYPES,                    ec2_rules.evaluate_ec2_rules),
+    (rds_rules.APPLICABLE_TYPES,                    rds_rules.evaluate_rds_rules),
+    (lb_rules.APPLICABLE_TYPES,                     lb_rules.evaluate_lb_rules),
+    (nat_rules.APPLICABLE_TYPES,                    nat_rules.evaluate_nat_rules),
+    (lambda_rules.APPLICABLE_TYPES,                 lambda_rules.evaluate_lambda_rules),
+    (iam_rules.APPLICABLE_TYPES,                    iam_rules.evaluate_iam_rules),
+    (cloudfront_rules.APPLICABLE_TYPES,             cloudfront_rules.evaluate_cloudfront_rules),
+    (cloudfront_rules.CLOUDWATCH_APPLICABLE_TYPES,  cloudfront_rules.evaluate_cloudwatch_rules),
+    (vpc_rules.APPLICABLE_TYPES,                    vpc_rules.evaluate_vpc_rules),
+    (storage_rules.APPLICABLE_TYPES,                storage_rules.evaluate_storage_rules),
+)
+
+_RULES_BY_RTYPE: dict[str, tuple] = {}
+for _types, _rule_fn in _RULE_ENGINES:
+    for _rtype in _types:
+        _RULES_BY_RTYPE[_rtype] = _RULES_BY_RTYPE.get(_rtype, ()) + (_rule_fn,)
+
 # Track running scans to prevent duplicates
 _active_scans: set[str] = set()  # scan_ids currently running
 
@@ -92,33 +115,16 @@ def _scan_region_type(region: str, rtype: str, scanner_fn) -> tuple[list, list]:
     try:
         logger.info(f"[Parallel] Scanning {rtype} in {region}")
         raw_resources = scanner_fn(region)
+        rule_fns = _RULES_BY_RTYPE.get(rtype, ())
 
         for r in raw_resources:
-            r["region"] = r.get("region", region)
+            if not isinstance(r, ScannedResource):
+                r["region"] = r.get("region", region)
 
-            # Rules engine — dispatch by resource type
-            if rtype == "EC2":
-                violations = evaluate_ec2_rules(r)
-            elif rtype == "RDS":
-                violations = evaluate_rds_rules(r)
-            elif rtype == "LB":
-                violations = evaluate_lb_rules(r)
-            elif rtype == "NAT":
-                violations = evaluate_nat_rules(r)
-            elif rtype == "Lambda":
-                violations = evaluate_lambda_rules(r)
-            elif rtype == "IAM":
-                violations = evaluate_iam_rules(r)
-            elif rtype == "CloudFront":
-                violations = evaluate_cloudfront_rules(r)
-            elif rtype == "CloudWatch":
-                violations = evaluate_cloudwatch_rules(r)
-            elif rtype == "VPC":
-                violations = evaluate_vpc_rules(r)
-            elif rtype in {"DynamoDB", "ElastiCache", "Route53", "ECS"}:
-                violations = []  # No dedicated rules yet — clean by default
-            else:
-                violations = evaluate_storage_rules(r)
+            # Rules engine — only the engines registered for this resource type
+            violations = []
+            for rule_fn in rule_fns:
+                violations.extend(rule_fn(r))
 
             # Governance checks (only for regional cloud resources)
             if rtype not in {"IAM", "CloudFront"}:
@@ -128,10 +134,13 @@ def _scan_region_type(region: str, rtype: str, scanner_fn) -> tuple[list, list]:
             if rtype == "RDS":
                 violations += check_encryption(r)
 
-            risk_score = compute_risk_score(violations)
-            r["risk_score"] = risk_score
-            r["violation_count"] = len(violations)
-            resources_out.append(r)
+            # Stored and serialised resources are plain dicts
+            record = r.to_dict() if isinstance(r, ScannedResource) else r
+            if isinstance(record.get("raw_data"), RawData):
+                record["raw_data"] = record["raw_data"].to_dict()
+            record["risk_score"] = compute_risk_score(violations)
+            record["violation_count"] = len(violations)
+            resources_out.append(record)
 
             for v in violations:
                 violations_out.append({
@@ -176,22 +185,19 @@ def _run_scan(scan_id: str, regions: list[str], resource_types: list[str]) -> No
         all_resources: list[dict[str, Any]] = []
         all_violations: list[dict[str, Any]] = []
 
-        # Build list of (region, rtype, scanner_fn) tasks
+        # Build list of (region, rtype, scanner_fn) tasks, interleaved by
+        # resource type so every region starts scanning straight away.
         # Global scanners (IAM, CloudFront) run once for the first region only
-        seen_global: set[str] = set()
         tasks = []
-        for region in regions:
-            for rtype, scanner_fn in SCANNERS.items():
-                if rtype not in resource_types:
-                    continue
-                if rtype in _GLOBAL_SCANNERS:
-                    if rtype in seen_global:
-                        continue
-                    seen_global.add(rtype)
+        for rtype, scanner_fn in SCANNERS.items():
+            if rtype not in resource_types:
+                continue
+            for region in regions[:1] if rtype in _GLOBAL_SCANNERS else regions:
                 tasks.append((region, rtype, scanner_fn))
 
         # Run all region×resource-type combinations in parallel
-        with ThreadPoolExecutor(max_workers=min(len(tasks), 16)) as pool:
+        workers = min(len(tasks), _SCAN_WORKERS_PER_REGION * len(regions), _MAX_SCAN_WORKERS)
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
             futures = {
                 pool.submit(_scan_region_type, region, rtype, fn): (region, rtype)
                 for region, rtype, fn in tasks
@@ -4,13 +4,14 @@ Data survives backend restarts — no database required.
 """
 from __future__ import annotations
 
-import json
 import logging
 import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 logger = logging.getLogger(__name__)
 _lock = threading.Lock()
 
@@ -45,8 +46,7 @@ def _load() -> None:
     if not _DATA_FILE.exists():
         return
     try:
-        with open(_DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(_DATA_FILE.read_bytes())
         scan_sessions.update(data.get("scan_sessions", {}))
         scan_resources.update(data.get("scan_resources", {}))
         scan_violations.update(data.get("scan_violations", {}))
@@ -75,8 +75,10 @@ def save() -> None:
                 "scan_risk": scan_risk,
                 "remediation_logs": remediation_logs,
             }
-            with open(_DATA_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, default=str)
+            # orjson writes dicts and slotted dataclass records (Violation,
+            # ScannedResource) straight to bytes, and datetimes as ISO 8601 —
+            # the same form the API responses use
+            _DATA_FILE.write_bytes(orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS))
         except Exception as e:
             logger.warning(f"Could not save scan data: {e}")
 
@@ -7,6 +7,7 @@ import logging
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import get_settings
 
@@ -24,6 +25,9 @@ app = FastAPI(
     version="4.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    # Scan payloads are thousands of small resource/violation dicts —
+    # orjson serializes them several times faster than the stdlib encoder.
+    default_response_class=ORJSONResponse,
 )
 
 # ── CORS ──────────────────────────────────────────────────────────────────────
@@ -10,10 +10,11 @@ from __future__ import annotations
 
 import csv
 import io
-import json
 from datetime import datetime
 from typing import Any
 
+import orjson
+
 
 # ── CSV Generators ────────────────────────────────────────────────────────────
 
@@ -54,8 +55,8 @@ def build_json_bundle(
     violations: list[dict[str, Any]],
     cost_summary: dict[str, Any],
     recommendations: list[dict[str, Any]],
-) -> str:
-    """Return a formatted JSON string of the complete scan bundle."""
+) -> bytes:
+    """Return the complete scan bundle as formatted UTF-8 JSON bytes."""
     total_savings = round(
         sum(r.get("estimated_monthly_savings", 0) for r in recommendations), 2
     )
@@ -72,7 +73,9 @@ def build_json_bundle(
         "violations": violations,
         "recommendations": recommendations,
     }
-    return json.dumps(bundle, indent=2, default=str)
+    return orjson.dumps(
+        bundle, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str,
+    )
 
 
 # ── HTML Report Helpers (Python 3.9 compatible) ───────────────────────────────
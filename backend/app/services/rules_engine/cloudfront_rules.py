@@ -7,6 +7,10 @@ Rules: CF-001 (no WAF), CF-002 (HTTP allowed), CF-003 (no geo-restriction),
 from __future__ import annotations
 from typing import Any
 
+# Resource types each engine in this module can produce violations for
+APPLICABLE_TYPES = frozenset({"CloudFront"})
+CLOUDWATCH_APPLICABLE_TYPES = frozenset({"CloudWatch"})
+
 
 def evaluate_cloudfront_rules(resource: dict[str, Any]) -> list[dict[str, Any]]:
     violations = []
@@ -0,0 +1,22 @@
+"""
+Shared string constants for the rules engine.
+
+Severity and compliance-framework labels are written into every violation and
+later used as grouping keys (severity summaries, compliance scoring), so they
+are interned once here and every engine reuses the same objects.
+"""
+from __future__ import annotations
+
+import sys
+
+# Severities
+CRITICAL = sys.intern("CRITICAL")
+HIGH = sys.intern("HIGH")
+MEDIUM = sys.intern("MEDIUM")
+LOW = sys.intern("LOW")
+INFO = sys.intern("INFO")
+
+# Compliance frameworks
+FINOPS = sys.intern("FinOps")
+CIS_AWS = sys.intern("CIS-AWS")
+GOVERNANCE = sys.intern("Governance")
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from typing import Any
 
+# Resource types this engine can produce violations for
+APPLICABLE_TYPES = frozenset({"EC2"})
+
 # Rightsizing map: oversized type → suggested smaller type
 _RIGHTSIZE_MAP = {
     "m5.xlarge":   "m5.large",
@@ -7,6 +7,9 @@ Rules: IAM-001 (unused user), IAM-002 (root MFA), IAM-003 (old access keys),
 from __future__ import annotations
 from typing import Any
 
+# Resource types this engine can produce violations for
+APPLICABLE_TYPES = frozenset({"IAM"})
+
 
 def evaluate_iam_rules(resource: dict[str, Any]) -> list[dict[str, Any]]:
     violations = []
@@ -7,6 +7,9 @@ Rules: LAMBDA-001 (unused), LAMBDA-002 (oversized memory), LAMBDA-003 (no timeou
 from __future__ import annotations
 from typing import Any
 
+# Resource types this engine can produce violations for
+APPLICABLE_TYPES = frozenset({"Lambda"})
+
 # Lambda pricing: ~$0.0000166667 per GB-second + $0.20 per 1M requests
 _GB_SECOND_PRICE = 0.0000166667
 _REQ_PRICE_PER_MILLION = 0.20
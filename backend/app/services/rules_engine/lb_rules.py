@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from typing import Any
 
+# Resource types this engine can produce violations for
+APPLICABLE_TYPES = frozenset({"LB"})
+
 # NAT Gateway fixed costs: ~$0.045/hr = ~$32.40/month (plus data transfer)
 _NAT_FIXED_MONTHLY_COST = 32.40
 
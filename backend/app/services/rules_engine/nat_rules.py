@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from typing import Any
 
+# Resource types this engine can produce violations for
+APPLICABLE_TYPES = frozenset({"NAT"})
+
 # NAT Gateway is expensive: ~$32.40/month fixed + $0.045/GB data transfer
 _NAT_FIXED_MONTHLY_COST = 32.40
 
@@ -0,0 +1,80 @@
+"""
+Declarative threshold rules.
+
+Rules that only compare ``raw_data`` fields against fixed thresholds are
+described as ``RuleSpec`` rows and compiled once at import into a single
+evaluator per resource type. Adding such a rule means adding a table row
+rather than another hand-written branch.
+"""
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping
+
+from app.services.rules_engine.violation import Violation
+
+_OPS: dict[str, Callable[[Any, Any], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+    "in": lambda value, threshold: value in threshold,
+    "not": lambda value, _threshold: not value,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class Condition:
+    field: str
+    op: str
+    threshold: Any = None
+
+
+@dataclass(slots=True, frozen=True)
+class RuleSpec:
+    rule_id: str
+    severity: str
+    compliance_framework: str
+    conditions: tuple[Condition, ...]
+    # str.format template over raw_data fields plus {rid}
+    message: str
+    recommendation: str
+
+
+def compile_rules(
+    resource_type: str,
+    specs: Iterable[RuleSpec],
+    defaults: Mapping[str, Any],
+) -> Callable[[dict[str, Any]], list[Violation]]:
+    """
+    Build an evaluator for ``specs``. Operators are resolved here, once, so
+    evaluation is a flat loop of comparisons. A rule fires when all of its
+    conditions hold; ``defaults`` fill in missing raw_data fields.
+    """
+    compiled = tuple(
+        (spec, tuple((c.field, _OPS[c.op], c.threshold) for c in spec.conditions))
+        for spec in specs
+    )
+
+    def evaluate(resource: dict[str, Any]) -> list[Violation]:
+        values = {**defaults, **resource.get("raw_data", {})}
+        violations: list[Violation] = []
+        for spec, checks in compiled:
+            if all(op(values.get(field), threshold) for field, op, threshold in checks):
+                rid = resource["resource_id"]
+                violations.append(Violation(
+                    rule_id=spec.rule_id,
+                    severity=spec.severity,
+                    message=spec.message.format_map({**values, "rid": rid}),
+                    recommendation=spec.recommendation,
+                    compliance_framework=spec.compliance_framework,
+                    resource_id=rid,
+                    resource_type=resource_type,
+                    region=resource["region"],
+                ))
+        return violations
+
+    return evaluate
@@ -1,21 +1,25 @@
 from __future__ import annotations
 
-from typing import Any
+from bisect import bisect_right
+from typing import Any, Iterable
+
+from app.services.rules_engine.constants import CRITICAL, HIGH, INFO, LOW, MEDIUM
 
 # Severity → base score mapping
 _SEVERITY_SCORE: dict[str, float] = {
-    "CRITICAL": 40.0,
-    "HIGH": 25.0,
-    "MEDIUM": 15.0,
-    "LOW": 5.0,
-    "INFO": 1.0,
+    CRITICAL: 40.0,
+    HIGH: 25.0,
+    MEDIUM: 15.0,
+    LOW: 5.0,
+    INFO: 1.0,
 }
 
 
-def compute_risk_score(violations: list[dict[str, Any]]) -> float:
+def compute_risk_score(violations: list[Any]) -> float:
     """
     Compute a risk score (0–100) for a resource based on its violations.
-    Multiple violations stack additively, capped at 100.
+    Multiple violations stack additively, capped at 100. Accepts Violation
+    records and plain violation dicts (governance checks) alike.
 
     Score thresholds for UI display:
       0–25   → LOW risk (green)
@@ -26,17 +30,23 @@ def compute_risk_score(violations: list[dict[str, Any]]) -> float:
     if not violations:
         return 0.0
 
-    score = sum(_SEVERITY_SCORE.get(v.get("severity", "INFO"), 1.0) for v in violations)
+    score = sum(_SEVERITY_SCORE.get(v.get("severity", INFO), 1.0) for v in violations)
     return round(min(score, 100.0), 1)
 
 
+# Lower bounds of the MEDIUM/HIGH/CRITICAL bands; any positive score below
+# the first bound is LOW. Indexed by bisect_right into _RISK_LABELS.
+_RISK_THRESHOLDS = (26, 51, 76)
+_RISK_LABELS = (LOW, MEDIUM, HIGH, CRITICAL)
+
+
 def risk_label(score: float) -> str:
-    if score >= 76:
-        return "CRITICAL"
-    elif score >= 51:
-        return "HIGH"
-    elif score >= 26:
-        return "MEDIUM"
-    elif score > 0:
-        return "LOW"
-    return "CLEAN"
+    if score <= 0:
+        return "CLEAN"
+    return _RISK_LABELS[bisect_right(_RISK_THRESHOLDS, score)]
+
+
+def risk_labels(scores: Iterable[float]) -> list[str]:
+    """Label a whole scan's scores in one pass (same bands as risk_label)."""
+    thresholds, labels = _RISK_THRESHOLDS, _RISK_LABELS
+    return [labels[bisect_right(thresholds, s)] if s > 0 else "CLEAN" for s in scores]
@@ -0,0 +1,38 @@
+"""
+Violation record shared by the rule engines.
+
+A slotted, frozen dataclass is a fraction of the size of the equivalent dict
+and gives faster attribute access in scoring and aggregation loops. ``get`` and
+item access are kept so the record can flow through code that still handles
+plain violation dicts (governance checks, the scan orchestrator); call
+``to_dict`` where a real dict is needed for JSON.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True, frozen=True)
+class Violation:
+    rule_id: str
+    severity: str
+    message: str
+    recommendation: str
+    compliance_framework: str
+    resource_id: str
+    resource_type: str
+    region: str
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {field: getattr(self, field) for field in self.__slots__}
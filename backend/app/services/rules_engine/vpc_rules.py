@@ -17,6 +17,9 @@ from __future__ import annotations
 import ipaddress
 from typing import Any
 
+# Resource types this engine can produce violations for
+APPLICABLE_TYPES = frozenset({"VPC"})
+
 
 def _violation(
     rule_id: str,
@@ -0,0 +1,212 @@
+"""
+Batched CloudWatch metrics
+==========================
+Shared helper for scanners that need one CloudWatch statistic per resource.
+Queries are sent through GetMetricData in batches of up to 500 instead of one
+GetMetricStatistics round-trip per resource. Results are cached per query for
+the current hour (bounded, oldest entries evicted first), so overlapping scans
+in the same worker do not pay for the same datapoints twice. A query that is
+already being fetched by another thread is waited on rather than re-issued.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Hashable
+
+from app.core.config import get_settings
+from app.utils.aws_client_factory import credentials_fingerprint, get_client
+
+logger = logging.getLogger(__name__)
+
+_MAX_QUERIES_PER_CALL = 500
+_CACHE_MAX_ENTRIES = 8192
+
+# A query is (namespace, metric_name, dimensions, stat)
+MetricQuery = tuple[str, str, dict[str, str], str]
+Datapoints = list[tuple[datetime, float]]
+
+# (credentials, region, namespace, metric, dimensions, stat, days, period) →
+# datapoints. The credentials fingerprint keeps accounts apart when keys change
+# at runtime (dimension values such as DB identifiers often repeat across
+# accounts). Entries are only valid for one window end; a new hour clears the cache.
+_cache: dict[tuple[Any, ...], Datapoints] = {}
+_cache_window_end: datetime | None = None
+_cache_lock = threading.Lock()
+
+
+class _InFlight:
+    """A query being fetched by one caller; others wait on ``done``."""
+    __slots__ = ("done", "points")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        # Left as None when the fetch failed
+        self.points: Datapoints | None = None
+
+
+# (cache key, window end) → fetch in progress. Guarded by _cache_lock.
+_in_flight: dict[tuple[Any, ...], _InFlight] = {}
+
+
+def _window_end(now: datetime | None = None) -> datetime:
+    """``now`` (default: the current time) truncated to the hour — the end of every query window."""
+    return (now or datetime.now(tz=timezone.utc)).replace(minute=0, second=0, microsecond=0)
+
+
+def _cache_key(
+    account: int, region: str, query: MetricQuery, days: int, period: int,
+) -> tuple[Any, ...]:
+    namespace, metric, dimensions, stat = query
+    dims = tuple(sorted(dimensions.items()))
+    return (account, region, namespace, metric, dims, stat, days, period)
+
+
+def get_metric_datapoints(
+    region: str,
+    queries: dict[Hashable, MetricQuery],
+    days: int,
+    period: int | None = None,
+    now: datetime | None = None,
+) -> dict[Hashable, Datapoints]:
+    """
+    Fetch datapoints for many metric queries in as few GetMetricData calls as possible.
+
+    ``queries`` maps a caller-chosen key (usually a resource ID) to a query.
+    The window covers the last ``days`` days; ``period`` defaults to the whole
+    window so each query yields a single datapoint. Returns datapoints newest
+    first per key. Keys whose batch failed are absent from the result, so
+    callers can tell "no data" (empty list) from "lookup failed".
+
+    Scanners pass the ``now`` they took at the start of the scan so every
+    batch in that scan shares one window, even across an hour boundary.
+    """
+    global _cache_window_end
+    period = period or days * 86400
+    end = _window_end(now)
+    start = end - timedelta(days=days)
+    account = credentials_fingerprint(get_settings())
+
+    results: dict[Hashable, Datapoints] = {}
+    pending: list[tuple[Hashable, MetricQuery]] = []
+    owned: dict[tuple[Any, ...], _InFlight] = {}
+    waiting: list[tuple[Hashable, _InFlight]] = []
+    with _cache_lock:
+        if _cache_window_end is None or end > _cache_window_end:
+            _cache.clear()
+            _cache_window_end = end
+        # A scan still on the previous hour's window neither reads nor fills the cache
+        use_cache = end == _cache_window_end
+        for key, query in queries.items():
+            cache_key = _cache_key(account, region, query, days, period)
+            cached = _cache.get(cache_key) if use_cache else None
+            if cached is not None:
+                results[key] = cached
+                continue
+            flight_key = (*cache_key, end)
+            flight = _in_flight.get(flight_key) or owned.get(flight_key)
+            if flight is not None:
+                waiting.append((key, flight))
+            else:
+                owned[flight_key] = _in_flight[flight_key] = _InFlight()
+                pending.append((key, query))
+
+    try:
+        if pending:
+            _fetch(account, region, pending, days, period, start, end, results, owned)
+    finally:
+        # Release every query this call claimed, fetched or not, so waiters never hang
+        with _cache_lock:
+            for flight_key, flight in owned.items():
+                _in_flight.pop(flight_key, None)
+                flight.done.set()
+
+    for key, flight in waiting:
+        flight.done.wait()
+        if flight.points is not None:
+            results[key] = flight.points
+    return results
+
+
+def _fetch(
+    account: int,
+    region: str,
+    pending: list[tuple[Hashable, MetricQuery]],
+    days: int,
+    period: int,
+    start: datetime,
+    end: datetime,
+    results: dict[Hashable, Datapoints],
+    owned: dict[tuple[Any, ...], _InFlight],
+) -> None:
+    """Issue GetMetricData for ``pending``; record results, cache entries and in-flight outcomes."""
+    cw = get_client("cloudwatch", region)
+    for offset in range(0, len(pending), _MAX_QUERIES_PER_CALL):
+        chunk = pending[offset: offset + _MAX_QUERIES_PER_CALL]
+        ids = {f"q{i}": item for i, item in enumerate(chunk)}
+        metric_queries = [
+            {
+                "Id": qid,
+                "MetricStat": {
+                    "Metric": {
+                        "Namespace": namespace,
+                        "MetricName": metric,
+                        "Dimensions": [{"Name": k, "Value": v} for k, v in dimensions.items()],
+                    },
+                    "Period": period,
+                    "Stat": stat,
+                },
+                "ReturnData": True,
+            }
+            for qid, (_, (namespace, metric, dimensions, stat)) in ids.items()
+        ]
+        try:
+            collected: dict[str, Datapoints] = {qid: [] for qid in ids}
+            kwargs: dict[str, Any] = {
+                "MetricDataQueries": metric_queries,
+                "StartTime": start,
+                "EndTime": end,
+                "ScanBy": "TimestampDescending",
+            }
+            while True:
+                resp = cw.get_metric_data(**kwargs)
+                for res in resp.get("MetricDataResults", []):
+                    collected[res["Id"]].extend(
+                        zip(res.get("Timestamps", []), res.get("Values", []))
+                    )
+                token = resp.get("NextToken")
+                if not token:
+                    break
+                kwargs["NextToken"] = token
+        except Exception as exc:
+            logger.debug(
+                "GetMetricData batch of %d queries failed in %s: %s", len(chunk), region, exc,
+            )
+            continue
+
+        with _cache_lock:
+            for qid, (key, query) in ids.items():
+                points = collected[qid]
+                results[key] = points
+                cache_key = _cache_key(account, region, query, days, period)
+                owned[(*cache_key, end)].points = points
+                if _cache_window_end == end:
+                    if len(_cache) >= _CACHE_MAX_ENTRIES:
+                        del _cache[next(iter(_cache))]
+                    _cache[cache_key] = points
+
+
+def batch_sums(
+    region: str,
+    namespace: str,
+    metric: str,
+    dims_by_id: dict[str, dict[str, str]],
+    days: int,
+    stat: str = "Sum",
+    now: datetime | None = None,
+) -> dict[str, float]:
+    """Sum of ``stat`` over the window for each resource ID in ``dims_by_id``."""
+    queries = {rid: (namespace, metric, dims, stat) for rid, dims in dims_by_id.items()}
+    datapoints = get_metric_datapoints(region, queries, days, now=now)
+    return {rid: sum(v for _, v in points) for rid, points in datapoints.items()}
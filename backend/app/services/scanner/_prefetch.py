@@ -0,0 +1,67 @@
+"""
+Page prefetching
+================
+Boto3 paginators fetch the next page only when the loop asks for it, so the
+per-item work on one page and the network round-trip for the next never
+overlap. ``prefetched`` moves the fetching onto a background thread that
+stays up to ``buffer`` pages ahead of the consumer.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+_PUT_TIMEOUT_SECONDS = 0.5
+
+
+class _Failed:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def prefetched(iterable: Iterable[T], buffer: int = 2) -> Iterator[T]:
+    """
+    Yield the items of ``iterable`` in order while a producer thread fetches
+    ahead. Exceptions raised by the iterable are re-raised in the consumer; if
+    the consumer stops early the producer is told to stop as well.
+    """
+    items: queue.Queue = queue.Queue(maxsize=buffer)
+    stop = threading.Event()
+
+    def _put(item: object) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=_PUT_TIMEOUT_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        try:
+            for item in iterable:
+                if not _put(item):
+                    return
+        except BaseException as exc:
+            _put(_Failed(exc))
+            return
+        _put(_DONE)
+
+    producer = threading.Thread(target=_produce, name="page-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failed):
+                raise item.exc
+            yield item
+    finally:
+        stop.set()
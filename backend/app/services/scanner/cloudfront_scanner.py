@@ -8,7 +8,8 @@ from __future__ import annotations
 
 import logging
 import random
-from typing import Any
+from datetime import datetime, timezone
+from typing import Any, Iterator
 
 logger = logging.getLogger(__name__)
 
@@ -19,15 +20,15 @@ _MOCK_DOMAINS = [
 
 
 def _mock_cloudfront(region: str) -> list[dict[str, Any]]:
-    random.seed(13)
+    rng = random.Random(13)
     items = []
     for i, domain in enumerate(_MOCK_DOMAINS):
-        dist_id = f"E{''.join(random.choices('ABCDEFGHIJKLMNOP', k=14))}"
-        requests_30d = random.choice([0, 0, 120, 45000, 2_000_000])
-        has_waf = random.random() > 0.5
-        https_only = random.random() > 0.4
-        has_geo_restriction = random.random() > 0.6
-        price_class = random.choice(["PriceClass_All", "PriceClass_200", "PriceClass_100"])
+        dist_id = f"E{''.join(rng.choices('ABCDEFGHIJKLMNOP', k=14))}"
+        requests_30d = rng.choice([0, 0, 120, 45000, 2_000_000])
+        has_waf = rng.random() > 0.5
+        https_only = rng.random() > 0.4
+        has_geo_restriction = rng.random() > 0.6
+        price_class = rng.choice(["PriceClass_All", "PriceClass_200", "PriceClass_100"])
         items.append({
             "resource_id": dist_id,
             "resource_type": "CloudFront",
@@ -45,57 +46,50 @@ def _mock_cloudfront(region: str) -> list[dict[str, Any]]:
                 "has_geo_restriction": has_geo_restriction,
                 "http_version": "http2",
                 "requests_30d": requests_30d,
-                "logging_enabled": random.random() > 0.5,
-                "origins_count": random.randint(1, 4),
+                "logging_enabled": rng.random() > 0.5,
+                "origins_count": rng.randint(1, 4),
             },
         })
     return items
 
 
-def scan_cloudfront(region: str) -> list[dict[str, Any]]:
-    """Scan CloudFront distributions. Falls back to mock if AWS unavailable."""
+def scan_cloudfront(region: str) -> Iterator[dict[str, Any]]:
+    """Scan CloudFront distributions, yielding each one as its page arrives.
+    Falls back to mock if AWS is unavailable before anything was yielded."""
+    emitted = False
     try:
-        import boto3
         from app.core.config import get_settings
+        from app.utils.aws_client_factory import get_client
         cfg = get_settings()
         if cfg.mock_aws:
-            return _mock_cloudfront(region)
+            yield from _mock_cloudfront(region)
+            return
 
-        session = boto3.Session(
-            aws_access_key_id=cfg.aws_access_key_id or None,
-            aws_secret_access_key=cfg.aws_secret_access_key or None,
-            region_name="us-east-1",
-        )
-        cf_client = session.client("cloudfront")
-        cw_client = session.client("cloudwatch", region_name="us-east-1")
+        from app.services.scanner._metrics import batch_sums
+        cf_client = get_client("cloudfront", "us-east-1")
 
-        from datetime import datetime, timezone, timedelta
-        items = []
         paginator = cf_client.get_paginator("list_distributions")
+        # One window end for every page, even across an hour boundary
+        now = datetime.now(timezone.utc)
         for page in paginator.paginate():
             dist_list = page.get("DistributionList", {}).get("Items", [])
+
+            # 30d request counts from CloudWatch — one batched call per page
+            requests_by_id = batch_sums(
+                "us-east-1", "AWS/CloudFront", "Requests",
+                {d["Id"]: {"DistributionId": d["Id"], "Region": "Global"} for d in dist_list},
+                days=30,
+                now=now,
+            )
+
             for dist in dist_list:
                 dist_id = dist["Id"]
                 origins = dist.get("Origins", {}).get("Items", [])
-
-                # 30d request count from CloudWatch
-                try:
-                    resp = cw_client.get_metric_statistics(
-                        Namespace="AWS/CloudFront",
-                        MetricName="Requests",
-                        Dimensions=[{"Name": "DistributionId", "Value": dist_id},
-                                    {"Name": "Region", "Value": "Global"}],
-                        StartTime=datetime.now(timezone.utc) - timedelta(days=30),
-                        EndTime=datetime.now(timezone.utc),
-                        Period=2592000,
-                        Statistics=["Sum"],
-                    )
-                    requests_30d = int(sum(p["Sum"] for p in resp.get("Datapoints", [])))
-                except Exception:
-                    requests_30d = -1
+                requests_30d = int(requests_by_id[dist_id]) if dist_id in requests_by_id else -1
 
                 gc = dist.get("Restrictions", {}).get("GeoRestriction", {})
-                items.append({
+                emitted = True
+                yield {
                     "resource_id": dist_id,
                     "resource_type": "CloudFront",
                     "region": "global",
@@ -115,9 +109,11 @@ def scan_cloudfront(region: str) -> list[dict[str, Any]]:
                         "logging_enabled": bool(dist.get("Logging", {}).get("Enabled")),
                         "origins_count": len(origins),
                     },
-                })
-        return items
+                }
 
     except Exception as e:
+        if emitted:
+            logger.warning(f"CloudFront scan aborted mid-stream: {e}")
+            return
         logger.warning(f"CloudFront scan failed: {e} — using mock")
-        return _mock_cloudfront(region)
+        yield from _mock_cloudfront(region)
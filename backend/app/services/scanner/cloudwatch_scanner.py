@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import logging
 import random
-from typing import Any
+from typing import Any, Iterator
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +27,12 @@ _MOCK_ALARM_NAMES = [
 
 
 def _mock_cloudwatch(region: str) -> list[dict[str, Any]]:
-    random.seed(99)
+    rng = random.Random(99)
     items = []
     # Log groups
     for lg in _MOCK_LOG_GROUPS:
-        has_retention = random.random() > 0.45
-        size_mb = random.randint(10, 50_000)
+        has_retention = rng.random() > 0.45
+        size_mb = rng.randint(10, 50_000)
         items.append({
             "resource_id": f"log-group:{region}:{lg}",
             "resource_type": "CloudWatch",
@@ -43,7 +43,7 @@ def _mock_cloudwatch(region: str) -> list[dict[str, Any]]:
             "raw_data": {
                 "resource_subtype": "log_group",
                 "log_group_name": lg,
-                "retention_days": random.choice([7, 14, 30, 60, 90, 180]) if has_retention else None,
+                "retention_days": rng.choice([7, 14, 30, 60, 90, 180]) if has_retention else None,
                 "has_retention": has_retention,
                 "stored_bytes": size_mb * 1024 * 1024,
                 "size_mb": size_mb,
@@ -51,7 +51,7 @@ def _mock_cloudwatch(region: str) -> list[dict[str, Any]]:
         })
     # Alarms
     for aname in _MOCK_ALARM_NAMES:
-        state = random.choice(["OK", "ALARM", "INSUFFICIENT_DATA", "INSUFFICIENT_DATA", "OK"])
+        state = rng.choice(["OK", "ALARM", "INSUFFICIENT_DATA", "INSUFFICIENT_DATA", "OK"])
         items.append({
             "resource_id": f"alarm:{region}:{aname}",
             "resource_type": "CloudWatch",
@@ -65,30 +65,27 @@ def _mock_cloudwatch(region: str) -> list[dict[str, Any]]:
                 "state": state,
                 "metric_name": aname.replace("-alarm", "").replace("-", "_"),
                 "namespace": "AWS/EC2",
-                "has_actions": random.random() > 0.4,
-                "last_state_change_days": random.randint(0, 120),
+                "has_actions": rng.random() > 0.4,
+                "last_state_change_days": rng.randint(0, 120),
             },
         })
     return items
 
 
-def scan_cloudwatch(region: str) -> list[dict[str, Any]]:
-    """Scan CloudWatch alarms and log groups. Falls back to mock if AWS unavailable."""
+def scan_cloudwatch(region: str) -> Iterator[dict[str, Any]]:
+    """Scan CloudWatch alarms and log groups, yielding each as its page arrives.
+    Falls back to mock if AWS is unavailable before anything was yielded."""
+    emitted = False
     try:
-        import boto3
         from app.core.config import get_settings
+        from app.utils.aws_client_factory import get_client
         cfg = get_settings()
         if cfg.mock_aws:
-            return _mock_cloudwatch(region)
+            yield from _mock_cloudwatch(region)
+            return
 
-        session = boto3.Session(
-            aws_access_key_id=cfg.aws_access_key_id or None,
-            aws_secret_access_key=cfg.aws_secret_access_key or None,
-            region_name=region,
-        )
-        cw = session.client("cloudwatch", region_name=region)
-        logs = session.client("logs", region_name=region)
-        items = []
+        cw = get_client("cloudwatch", region)
+        logs = get_client("logs", region)
 
         # Log groups
         lg_paginator = logs.get_paginator("describe_log_groups")
@@ -97,7 +94,8 @@ def scan_cloudwatch(region: str) -> list[dict[str, Any]]:
                 name = lg.get("logGroupName", "")
                 ret = lg.get("retentionInDays")
                 size_bytes = lg.get("storedBytes", 0)
-                items.append({
+                emitted = True
+                yield {
                     "resource_id": f"log-group:{region}:{name}",
                     "resource_type": "CloudWatch",
                     "region": region,
@@ -112,7 +110,7 @@ def scan_cloudwatch(region: str) -> list[dict[str, Any]]:
                         "stored_bytes": size_bytes,
                         "size_mb": round(size_bytes / 1024 / 1024, 1),
                     },
-                })
+                }
 
         # Alarms
         alarm_paginator = cw.get_paginator("describe_alarms")
@@ -123,7 +121,8 @@ def scan_cloudwatch(region: str) -> list[dict[str, Any]]:
                 state = alarm.get("StateValue", "OK")
                 lsc = alarm.get("StateUpdatedTimestamp")
                 last_change_days = (now - lsc.replace(tzinfo=timezone.utc)).days if lsc else 0
-                items.append({
+                emitted = True
+                yield {
                     "resource_id": f"alarm:{region}:{alarm['AlarmName']}",
                     "resource_type": "CloudWatch",
                     "region": region,
@@ -139,9 +138,11 @@ def scan_cloudwatch(region: str) -> list[dict[str, Any]]:
                         "has_actions": bool(alarm.get("AlarmActions")),
                         "last_state_change_days": last_change_days,
                     },
-                })
-        return items
+                }
 
     except Exception as e:
+        if emitted:
+            logger.warning(f"CloudWatch scan aborted mid-stream for {region}: {e}")
+            return
         logger.warning(f"CloudWatch scan failed for {region}: {e} — using mock")
-        return _mock_cloudwatch(region)
+        yield from _mock_cloudwatch(region)
@@ -2,58 +2,75 @@ from __future__ import annotations
 
 import random
 import uuid
-from typing import Any
+from typing import Any, Iterator
 
 from app.core.config import get_settings
 from app.utils.aws_client_factory import get_client
 
 
-def _mock_ebs_resources(region: str) -> list[dict[str, Any]]:
-    states = ["in-use", "in-use", "available", "available"]
-    volume_types = ["gp2", "gp3", "io1", "st1"]
+def _mock_ebs_resources(
+    region: str, count: int | None = None, seed: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Build mock EBS volumes. ``count`` overrides the default 3–6 volumes for
+    load tests and ``seed`` makes the attributes reproducible (unseeded by
+    default, so each mock scan varies); every random attribute is drawn for
+    the whole batch up front and the records are assembled in a single pass.
+    """
+    rng = random.Random(seed)
+    n = count if count is not None else rng.randint(3, 6)
+    states = rng.choices(["in-use", "in-use", "available", "available"], k=n)
+    sizes = rng.choices([20, 50, 100, 200, 500], k=n)
+    environments = rng.choices(["production", "staging", ""], k=n)
+    owners = rng.choices(["team-platform", ""], k=n)
+    volume_types = rng.choices(["gp2", "gp3", "io1", "st1"], k=n)
+    encrypted = rng.choices([True, True, False], k=n)
+    iops = [rng.randint(100, 3000) for _ in range(n)]
+
     resources = []
-    for i in range(random.randint(3, 6)):
-        state = random.choice(states)
-        size_gb = random.choice([20, 50, 100, 200, 500])
+    for i in range(n):
+        in_use = states[i] == "in-use"
         resources.append({
             "resource_id": f"vol-{uuid.uuid4().hex[:16]}",
             "resource_type": "EBS",
             "region": region,
-            "name": f"data-volume-{i+1:02d}" if state == "in-use" else None,
-            "state": state,
+            "name": f"data-volume-{i+1:02d}" if in_use else None,
+            "state": states[i],
             "tags": {
-                "Environment": random.choice(["production", "staging", ""]),
-                "Owner": random.choice(["team-platform", ""]),
+                "Environment": environments[i],
+                "Owner": owners[i],
             },
             "raw_data": {
-                "size_gb": size_gb,
-                "volume_type": random.choice(volume_types),
-                "encrypted": random.choice([True, True, False]),
-                "attached_instance": f"i-{uuid.uuid4().hex[:16]}" if state == "in-use" else None,
-                "iops": random.randint(100, 3000),
+                "size_gb": sizes[i],
+                "volume_type": volume_types[i],
+                "encrypted": encrypted[i],
+                "attached_instance": f"i-{uuid.uuid4().hex[:16]}" if in_use else None,
+                "iops": iops[i],
             },
         })
     return resources
 
 
-def scan_ebs(region: str) -> list[dict[str, Any]]:
+def scan_ebs(region: str) -> Iterator[dict[str, Any]]:
     settings = get_settings()
     if settings.mock_aws:
-        return _mock_ebs_resources(region)
+        yield from _mock_ebs_resources(region)
+        return
 
     client = get_client("ec2", region)
     paginator = client.get_paginator("describe_volumes")
-    resources = []
 
     for page in paginator.paginate():
         for vol in page["Volumes"]:
-            name = next(
-                (t["Value"] for t in vol.get("Tags", []) if t["Key"] == "Name"),
-                None,
-            )
-            tags = {t["Key"]: t["Value"] for t in vol.get("Tags", [])}
+            tags: dict[str, str] = {}
+            name = None
+            for t in vol.get("Tags", ()):
+                key = t["Key"]
+                tags[key] = t["Value"]
+                if key == "Name":
+                    name = t["Value"]
             attachments = vol.get("Attachments", [])
-            resources.append({
+            yield {
                 "resource_id": vol["VolumeId"],
                 "resource_type": "EBS",
                 "region": region,
@@ -67,5 +84,4 @@ def scan_ebs(region: str) -> list[dict[str, Any]]:
                     "attached_instance": attachments[0].get("InstanceId") if attachments else None,
                     "iops": vol.get("Iops"),
                 },
-            })
-    return resources
+            }
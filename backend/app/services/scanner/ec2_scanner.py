@@ -1,186 +1,193 @@
 from app.core.config import get_settings
+from app.services.scanner._metrics import get_metric_datapoints
+from app.services.scanner.resource import ScannedResource
 from app.utils.aws_client_factory import get_client
 
+import functools
 import random
-import uuid
+import secrets
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Iterator
 
 # Instance families eligible for Spot (stateless, fault-tolerant workloads)
-_SPOT_ELIGIBLE_FAMILIES = {
+_SPOT_ELIGIBLE_FAMILIES = frozenset({
     "t3", "t3a", "t4g", "m5", "m5a", "m6i", "m6a",
     "c5", "c5a", "c6i", "c6a", "r5", "r5a", "r6i",
-}
+})
 
 # Instance families with strong RI savings potential (consistent On-Demand usage)
-_RI_CANDIDATE_FAMILIES = {"m5", "m6i", "c5", "c6i", "r5", "r6i", "t3"}
+_RI_CANDIDATE_FAMILIES = frozenset({"m5", "m6i", "c5", "c6i", "r5", "r6i", "t3"})
+
 
+# Instance states worth auditing — everything except shutting-down/terminated
+_SCANNED_STATES = ["pending", "running", "stopping", "stopped"]
 
+
+@functools.lru_cache(maxsize=256)
 def _get_instance_family(instance_type: str) -> str:
     """Extract family prefix from instance type, e.g. 'm5.xlarge' → 'm5'."""
     return instance_type.split(".")[0] if instance_type else ""
 
 
-def _get_avg_cpu(instance_id: str, region: str, period_days: int = 7) -> float:
-    """Fetch average CPU utilization from CloudWatch for the last N days."""
-    try:
-        cw = get_client("cloudwatch", region)
-        end = datetime.now(tz=timezone.utc)
-        start = end - timedelta(days=period_days)
-        resp = cw.get_metric_statistics(
-            Namespace="AWS/EC2",
-            MetricName="CPUUtilization",
-            Dimensions=[{"Name": "InstanceId", "Value": instance_id}],
-            StartTime=start,
-            EndTime=end,
-            Period=period_days * 86400,
-            Statistics=["Average"],
-        )
-        points = resp.get("Datapoints", [])
-        if points:
-            return round(points[0]["Average"], 2)
-    except Exception:
-        pass
-    return 0.0
-
-
-def _get_network_gb(instance_id: str, region: str, metric: str, period_days: int = 7) -> float:
-    """Fetch NetworkIn or NetworkOut bytes and convert to GB."""
-    try:
-        cw = get_client("cloudwatch", region)
-        end = datetime.now(tz=timezone.utc)
-        start = end - timedelta(days=period_days)
-        resp = cw.get_metric_statistics(
-            Namespace="AWS/EC2",
-            MetricName=metric,
-            Dimensions=[{"Name": "InstanceId", "Value": instance_id}],
-            StartTime=start,
-            EndTime=end,
-            Period=period_days * 86400,
-            Statistics=["Sum"],
-        )
-        points = resp.get("Datapoints", [])
-        if points:
-            return round(points[0]["Sum"] / (1024 ** 3), 4)
-    except Exception:
-        pass
-    return 0.0
+_METRIC_PERIOD_DAYS = 7
+
+# raw_data field → (CloudWatch metric, statistic, scale applied to the value, rounding)
+_INSTANCE_METRICS: dict[str, tuple[str, str, float, int]] = {
+    "avg_cpu_percent": ("CPUUtilization", "Average", 1.0, 2),
+    "network_in_gb": ("NetworkIn", "Sum", 1024 ** 3, 4),
+    "network_out_gb": ("NetworkOut", "Sum", 1024 ** 3, 4),
+}
 
 
-def _mock_ec2_resources(region: str) -> list[dict[str, Any]]:
+def _get_instance_metrics(
+    instance_ids: list[str], region: str, now: datetime,
+) -> dict[str, dict[str, float]]:
+    """
+    Fetch CPU and network metrics for the last week for every instance in one
+    batched GetMetricData pass. Instances or metrics without data map to 0.0.
+    """
+    queries = {
+        (instance_id, field): ("AWS/EC2", metric, {"InstanceId": instance_id}, stat)
+        for instance_id in instance_ids
+        for field, (metric, stat, _, _) in _INSTANCE_METRICS.items()
+    }
+    datapoints = get_metric_datapoints(region, queries, days=_METRIC_PERIOD_DAYS, now=now)
+
+    metrics: dict[str, dict[str, float]] = {}
+    for instance_id in instance_ids:
+        values = metrics[instance_id] = {}
+        for field, (_, _, scale, ndigits) in _INSTANCE_METRICS.items():
+            points = datapoints.get((instance_id, field))
+            values[field] = round(points[0][1] / scale, ndigits) if points else 0.0
+    return metrics
+
+
+def _mock_ec2_resources(region: str, count: int | None = None) -> list[ScannedResource]:
+    """
+    Build mock EC2 instances. ``count`` overrides the default 4–8 instances
+    for load tests; random attributes are drawn for the whole batch up front.
+    """
     instance_types = [
         "t3.micro", "t3.small", "t3.medium", "t3.large",
         "m5.large", "m5.xlarge", "c5.2xlarge", "r5.xlarge",
     ]
-    states = ["running", "running", "running", "stopped", "stopped"]
-    asg_names = ["web-asg", "api-asg", ""]
+    n = count if count is not None else random.randint(4, 8)
+    itypes = random.choices(instance_types, k=n)
+    states = random.choices(["running", "running", "running", "stopped", "stopped"], k=n)
+    asg_names = random.choices(["web-asg", "api-asg", ""], k=n)
+    environments = random.choices(["production", "staging", "dev", ""], k=n)
+    owners = random.choices(["team-platform", "team-backend", ""], k=n)
+    projects = random.choices(["cloud-audit", "ecommerce", ""], k=n)
+    # Simulate a launch time between 5 and 120 days ago
+    launch_days = random.choices(range(5, 121), k=n)
+    octets = random.choices(range(1, 255), k=3 * n)
+
     resources = []
-    for i in range(random.randint(4, 8)):
-        itype = random.choice(instance_types)
-        state = random.choice(states)
-        cpu = random.uniform(1.0, 8.0) if state == "running" else 0.0
+    now = datetime.now(tz=timezone.utc)
+    for i in range(n):
+        itype, state, asg_name, launch_days_ago = itypes[i], states[i], asg_names[i], launch_days[i]
+        running = state == "running"
         family = _get_instance_family(itype)
-        asg_name = random.choice(asg_names)
-
-        # Simulate a launch time between 5 and 120 days ago
-        launch_days_ago = random.randint(5, 120)
-        launch_time = (datetime.now(tz=timezone.utc) - timedelta(days=launch_days_ago)).isoformat()
-
-        resources.append({
-            "resource_id": f"i-{uuid.uuid4().hex[:16]}",
-            "resource_type": "EC2",
-            "region": region,
-            "name": f"app-server-{i + 1:02d}",
-            "state": state,
-            "tags": {
-                "Environment": random.choice(["production", "staging", "dev", ""]),
-                "Owner": random.choice(["team-platform", "team-backend", ""]),
-                "Project": random.choice(["cloud-audit", "ecommerce", ""]),
+        o1, o2, o3 = octets[3 * i: 3 * i + 3]
+
+        resources.append(ScannedResource(
+            resource_id=f"i-{secrets.token_hex(8)}",
+            resource_type="EC2",
+            region=region,
+            name=f"app-server-{i + 1:02d}",
+            state=state,
+            tags={
+                "Environment": environments[i],
+                "Owner": owners[i],
+                "Project": projects[i],
                 **({"aws:autoscaling:groupName": asg_name} if asg_name else {}),
             },
-            "raw_data": {
+            raw_data={
                 "instance_type": itype,
-                "avg_cpu_percent": round(cpu, 2),
-                "launch_time": launch_time,
+                "avg_cpu_percent": round(random.uniform(1.0, 8.0), 2) if running else 0.0,
+                "launch_time": (now - timedelta(days=launch_days_ago)).isoformat(),
                 "launch_days_ago": launch_days_ago,
-                "vpc_id": f"vpc-{uuid.uuid4().hex[:8]}",
-                "public_ip": (
-                    f"54.{random.randint(1, 254)}.{random.randint(1, 254)}.{random.randint(1, 254)}"
-                    if state == "running" else None
-                ),
+                "vpc_id": f"vpc-{secrets.token_hex(4)}",
+                "public_ip": f"54.{o1}.{o2}.{o3}" if running else None,
                 "in_asg": bool(asg_name),
                 "spot_eligible": family in _SPOT_ELIGIBLE_FAMILIES,
                 "ri_candidate": family in _RI_CANDIDATE_FAMILIES and launch_days_ago > 30,
-                "network_in_gb": round(random.uniform(0.1, 50.0), 3) if state == "running" else 0.0,
-                "network_out_gb": round(random.uniform(0.1, 20.0), 3) if state == "running" else 0.0,
+                "network_in_gb": round(random.uniform(0.1, 50.0), 3) if running else 0.0,
+                "network_out_gb": round(random.uniform(0.1, 20.0), 3) if running else 0.0,
             },
-        })
+        ))
     return resources
 
 
-def scan_ec2(region: str) -> list[dict[str, Any]]:
+def scan_ec2(region: str) -> Iterator[ScannedResource]:
     settings = get_settings()
     if settings.mock_aws:
-        return _mock_ec2_resources(region)
+        yield from _mock_ec2_resources(region)
+        return
 
     client = get_client("ec2", region)
     paginator = client.get_paginator("describe_instances")
-    resources = []
     now = datetime.now(tz=timezone.utc)
 
-    for page in paginator.paginate():
-        for reservation in page["Reservations"]:
-            for instance in reservation["Instances"]:
-                instance_id = instance["InstanceId"]
-                tags = {t["Key"]: t["Value"] for t in instance.get("Tags", [])}
-                name = tags.get("Name")
-                state = instance["State"]["Name"]
-                itype = instance.get("InstanceType", "")
-                family = _get_instance_family(itype)
-
-                # Fetch real CPU for running instances only
-                avg_cpu = _get_avg_cpu(instance_id, region) if state == "running" else 0.0
-
-                # Network metrics for running instances
-                network_in_gb = 0.0
-                network_out_gb = 0.0
-                if state == "running":
-                    network_in_gb = _get_network_gb(instance_id, region, "NetworkIn")
-                    network_out_gb = _get_network_gb(instance_id, region, "NetworkOut")
-
-                # ASG membership: check for the standard autoscaling tag
-                in_asg = bool(tags.get("aws:autoscaling:groupName"))
-
-                # Days since launch
-                launch_time = instance.get("LaunchTime")
-                launch_days_ago = (now - launch_time).days if launch_time else 0
-
-                # RI candidate: running > 30 days on a RI-eligible family (On-Demand assumed)
-                ri_candidate = (
-                    family in _RI_CANDIDATE_FAMILIES
-                    and launch_days_ago > 30
-                    and state == "running"
-                )
-
-                resources.append({
-                    "resource_id": instance_id,
-                    "resource_type": "EC2",
-                    "region": region,
-                    "name": name,
-                    "state": state,
-                    "tags": tags,
-                    "raw_data": {
-                        "instance_type": itype,
-                        "launch_time": str(launch_time),
-                        "launch_days_ago": launch_days_ago,
-                        "vpc_id": instance.get("VpcId"),
-                        "public_ip": instance.get("PublicIpAddress"),
-                        "avg_cpu_percent": avg_cpu,
-                        "in_asg": in_asg,
-                        "spot_eligible": family in _SPOT_ELIGIBLE_FAMILIES,
-                        "ri_candidate": ri_candidate,
-                        "network_in_gb": network_in_gb,
-                        "network_out_gb": network_out_gb,
-                    },
-                })
-    return resources
+    # Terminated instances are filtered out server-side; they carry no cost or risk
+    pages = paginator.paginate(
+        Filters=[{"Name": "instance-state-name", "Values": _SCANNED_STATES}],
+        PaginationConfig={"PageSize": 1000},
+    )
+    for page in pages:
+        instances = [i for reservation in page["Reservations"] for i in reservation["Instances"]]
+        # Metrics only for running instances, fetched for the whole page at once
+        metrics = _get_instance_metrics(
+            [i["InstanceId"] for i in instances if i["State"]["Name"] == "running"], region, now,
+        )
+
+        for instance in instances:
+            instance_id = instance["InstanceId"]
+            tags = {t["Key"]: t["Value"] for t in instance.get("Tags", [])}
+            name = tags.get("Name")
+            state = instance["State"]["Name"]
+            itype = instance.get("InstanceType", "")
+            family = _get_instance_family(itype)
+            spot_eligible = family in _SPOT_ELIGIBLE_FAMILIES
+            ri_family = family in _RI_CANDIDATE_FAMILIES
+
+            instance_metrics = metrics.get(instance_id, {})
+            avg_cpu = instance_metrics.get("avg_cpu_percent", 0.0)
+            network_in_gb = instance_metrics.get("network_in_gb", 0.0)
+            network_out_gb = instance_metrics.get("network_out_gb", 0.0)
+
+            # ASG membership: check for the standard autoscaling tag
+            in_asg = bool(tags.get("aws:autoscaling:groupName"))
+
+            # Days since launch
+            launch_time = instance.get("LaunchTime")
+            launch_days_ago = (now - launch_time).days if launch_time else 0
+
+            # RI candidate: running > 30 days on a RI-eligible family (On-Demand assumed)
+            ri_candidate = (
+                ri_family
+                and launch_days_ago > 30
+                and state == "running"
+            )
+
+            yield ScannedResource(
+                resource_id=instance_id,
+                resource_type="EC2",
+                region=region,
+                name=name,
+                state=state,
+                tags=tags,
+                raw_data={
+                    "instance_type": itype,
+                    "launch_time": launch_time,
+                    "launch_days_ago": launch_days_ago,
+                    "vpc_id": instance.get("VpcId"),
+                    "public_ip": instance.get("PublicIpAddress"),
+                    "avg_cpu_percent": avg_cpu,
+                    "in_asg": in_asg,
+                    "spot_eligible": spot_eligible,
+                    "ri_candidate": ri_candidate,
+                    "network_in_gb": network_in_gb,
+                    "network_out_gb": network_out_gb,
+                },
+            )
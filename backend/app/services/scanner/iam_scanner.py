@@ -10,6 +10,11 @@ import logging
 import random
 from datetime import datetime, timezone
 from typing import Any
+from urllib.parse import unquote
+
+import orjson
+
+from app.utils.date_helpers import parse_iso
 
 logger = logging.getLogger(__name__)
 
@@ -20,14 +25,14 @@ _MOCK_USERS = [
 
 
 def _mock_iam(region: str) -> list[dict[str, Any]]:
-    random.seed(7)
+    rng = random.Random(7)
     items = []
     for i, uname in enumerate(_MOCK_USERS):
-        key_age_days = random.choice([10, 45, 91, 120, 200, 365, 400])
-        last_activity_days = random.choice([0, 5, 30, 95, 200, 400])
-        has_mfa = random.random() > 0.35
-        has_console_access = random.random() > 0.4
-        has_wildcard_policy = random.random() > 0.6
+        key_age_days = rng.choice([10, 45, 91, 120, 200, 365, 400])
+        last_activity_days = rng.choice([0, 5, 30, 95, 200, 400])
+        has_mfa = rng.random() > 0.35
+        has_console_access = rng.random() > 0.4
+        has_wildcard_policy = rng.random() > 0.6
         items.append({
             "resource_id": f"arn:aws:iam::123456789012:user/{uname}",
             "resource_type": "IAM",
@@ -43,7 +48,7 @@ def _mock_iam(region: str) -> list[dict[str, Any]]:
                 "key_age_days": key_age_days,
                 "last_activity_days": last_activity_days,
                 "has_wildcard_policy": has_wildcard_policy,
-                "num_access_keys": random.randint(0, 2),
+                "num_access_keys": rng.randint(0, 2),
                 "groups": [f"group-{i % 3}"],
                 "is_root": False,
             },
@@ -59,29 +64,73 @@ def _mock_iam(region: str) -> list[dict[str, Any]]:
         "raw_data": {
             "resource_subtype": "root",
             "username": "root",
-            "has_mfa": random.random() > 0.3,
-            "last_activity_days": random.choice([0, 30, 90, 200]),
+            "has_mfa": rng.random() > 0.3,
+            "last_activity_days": rng.choice([0, 30, 90, 200]),
             "is_root": True,
         },
     })
     return items
 
 
+def _policy_has_wildcard(doc: dict[str, Any] | str) -> bool:
+    """True if any Allow statement in the policy grants Action "*"."""
+    if isinstance(doc, str):
+        # botocore normally decodes policy documents; handle the raw URL-encoded form too
+        doc = orjson.loads(unquote(doc))
+    stmts = doc.get("Statement", [])
+    if isinstance(stmts, dict):
+        stmts = [stmts]
+    return any(
+        s.get("Effect") == "Allow"
+        and "*" in (acts if isinstance(acts := s.get("Action", []), list) else [acts])
+        for s in stmts
+    )
+
+
+def _inline_policies_by_user(iam: Any) -> dict[str, list[dict[str, Any] | str]] | None:
+    """
+    Inline policy documents for every user, keyed by user name, from a single
+    paginated GetAccountAuthorizationDetails walk. Returns None if the walk
+    fails (typically AccessDenied when the scanning role lacks
+    iam:GetAccountAuthorizationDetails), so callers can fall back to
+    ``_user_inline_policies``.
+    """
+    policies: dict[str, list[dict[str, Any] | str]] = {}
+    try:
+        paginator = iam.get_paginator("get_account_authorization_details")
+        for page in paginator.paginate(Filter=["User"]):
+            for user in page.get("UserDetailList", []):
+                policies[user["UserName"]] = [
+                    p.get("PolicyDocument", {}) for p in user.get("UserPolicyList", [])
+                ]
+    except Exception as exc:
+        logger.warning(
+            "GetAccountAuthorizationDetails failed (%s) — falling back to per-user "
+            "ListUserPolicies/GetUserPolicy for wildcard checks", exc,
+        )
+        return None
+    return policies
+
+
+def _user_inline_policies(iam: Any, uname: str) -> list[dict[str, Any] | str]:
+    """Inline policy documents for one user, one GetUserPolicy call per policy."""
+    names = iam.list_user_policies(UserName=uname).get("PolicyNames", [])
+    return [
+        iam.get_user_policy(UserName=uname, PolicyName=name).get("PolicyDocument", {})
+        for name in names
+    ]
+
+
 def scan_iam(region: str) -> list[dict[str, Any]]:
     """Scan IAM users and root account. IAM is global — region is accepted but ignored."""
     try:
-        import boto3
         from app.core.config import get_settings
+        from app.utils.aws_client_factory import get_client
         cfg = get_settings()
         if cfg.mock_aws:
             return _mock_iam(region)
 
-        session = boto3.Session(
-            aws_access_key_id=cfg.aws_access_key_id or None,
-            aws_secret_access_key=cfg.aws_secret_access_key or None,
-            region_name="us-east-1",
-        )
-        iam = session.client("iam")
+        iam = get_client("iam", "us-east-1")
         items = []
 
         # Credential report for all users
@@ -101,47 +150,46 @@ def scan_iam(region: str) -> list[dict[str, Any]]:
         else:
             return _mock_iam(region)
 
-        reader = csv.DictReader(_io.StringIO(report_csv))
+        reader = csv.reader(_io.StringIO(report_csv))
+        idx = {name: i for i, name in enumerate(next(reader, []))}
         now = datetime.now(timezone.utc)
+        policies_by_user = _inline_policies_by_user(iam)
+
+        def _cell(row: list[str], field: str, default: str = "") -> str:
+            i = idx.get(field)
+            return row[i] if i is not None and i < len(row) else default
+
+        def _age(row: list[str], field: str) -> int:
+            val = _cell(row, field, "N/A")
+            if val and val not in ("N/A", "no_information", "not_supported"):
+                try:
+                    dt = parse_iso(val)
+                    return (now - dt).days
+                except Exception:
+                    pass
+            return 0
 
         for row in reader:
-            uname = row.get("user", "")
+            uname = _cell(row, "user")
             is_root = uname == "<root_account>"
 
-            def _age(field: str) -> int:
-                val = row.get(field, "N/A")
-                if val and val not in ("N/A", "no_information", "not_supported"):
-                    try:
-                        dt = datetime.fromisoformat(val.replace("Z", "+00:00"))
-                        return (now - dt).days
-                    except Exception:
-                        pass
-                return 0
-
-            key1_age = _age("access_key_1_last_rotated")
-            key2_age = _age("access_key_2_last_rotated")
+            key1_age = _age(row, "access_key_1_last_rotated")
+            key2_age = _age(row, "access_key_2_last_rotated")
             key_age = max(key1_age, key2_age)
             last_used = min(
-                _age("access_key_1_last_used_date"),
-                _age("access_key_2_last_used_date"),
-            ) or _age("password_last_used")
+                _age(row, "access_key_1_last_used_date"),
+                _age(row, "access_key_2_last_used_date"),
+            ) or _age(row, "password_last_used")
 
             # Check for wildcard policies
             has_wildcard = False
             if not is_root:
                 try:
-                    pols = iam.list_user_policies(UserName=uname).get("PolicyNames", [])
-                    for pname in pols:
-                        doc = iam.get_user_policy(UserName=uname, PolicyName=pname)
-                        policy_doc = doc.get("PolicyDocument", {})
-                        stmts = policy_doc.get("Statement", [])
-                        for s in stmts:
-                            acts = s.get("Action", [])
-                            if isinstance(acts, str):
-                                acts = [acts]
-                            if "*" in acts and s.get("Effect") == "Allow":
-                                has_wildcard = True
-                                break
+                    if policies_by_user is None:
+                        user_policies = _user_inline_policies(iam, uname)
+                    else:
+                        user_policies = policies_by_user.get(uname, [])
+                    has_wildcard = any(map(_policy_has_wildcard, user_policies))
                 except Exception:
                     pass
 
@@ -155,13 +203,16 @@ def scan_iam(region: str) -> list[dict[str, Any]]:
                 "raw_data": {
                     "resource_subtype": "root" if is_root else "user",
                     "username": uname,
-                    "has_console_access": row.get("password_enabled") == "true",
-                    "has_mfa": row.get("mfa_active") == "true",
+                    "has_console_access": _cell(row, "password_enabled") == "true",
+                    "has_mfa": _cell(row, "mfa_active") == "true",
                     "key_age_days": key_age,
                     "last_activity_days": last_used,
                     "has_wildcard_policy": has_wildcard,
                     "is_root": is_root,
-                    "num_access_keys": sum(1 for k in ["access_key_1_active", "access_key_2_active"] if row.get(k) == "true"),
+                    "num_access_keys": sum(
+                        1 for k in ("access_key_1_active", "access_key_2_active")
+                        if _cell(row, k) == "true"
+                    ),
                     "groups": [],
                 },
             })
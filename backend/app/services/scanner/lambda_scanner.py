@@ -5,13 +5,26 @@ Discovers AWS Lambda functions and enriches with 30-day invocation metrics.
 """
 from __future__ import annotations
 
+import functools
 import logging
 import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Iterator
+
+from app.services.scanner.resource import ScannedResource
+from app.utils.date_helpers import parse_iso
 
 logger = logging.getLogger(__name__)
 
+# Concurrent per-function tag lookups
+_ENRICH_WORKERS = 10
+
+# Tags rarely change between back-to-back scans (scheduled + manual), so
+# lookups are cached per function ARN for this many seconds
+_TAGS_TTL_SECONDS = 900
+
 _MOCK_RUNTIMES = ["python3.11", "python3.10", "nodejs18.x", "nodejs20.x", "java17", "go1.x"]
 _MOCK_NAMES = [
     "api-authorizer", "image-processor", "data-pipeline-trigger", "email-sender",
@@ -20,118 +33,138 @@ _MOCK_NAMES = [
 ]
 
 
-def _mock_lambda(region: str) -> list[dict[str, Any]]:
-    random.seed(42)
+def _mock_lambda(region: str) -> list[ScannedResource]:
+    rng = random.Random(42)
     funcs = []
     for i, name in enumerate(_MOCK_NAMES):
-        invocations_30d = random.choice([0, 0, 0, 12, 340, 5800, 22000])
-        memory_mb = random.choice([128, 256, 512, 1024, 2048, 3008])
-        avg_duration_ms = random.randint(50, 8000)
-        timeout_sec = random.choice([3, 15, 30, 60, 300, 900])
-        last_modified_days = random.randint(0, 400)
-        funcs.append({
-            "resource_id": f"arn:aws:lambda:{region}:123456789012:function:{name}",
-            "resource_type": "Lambda",
-            "region": region,
-            "name": name,
-            "state": "Active",
-            "tags": {"Environment": "production"} if i % 3 != 0 else {},
-            "raw_data": {
+        invocations_30d = rng.choice([0, 0, 0, 12, 340, 5800, 22000])
+        memory_mb = rng.choice([128, 256, 512, 1024, 2048, 3008])
+        avg_duration_ms = rng.randint(50, 8000)
+        timeout_sec = rng.choice([3, 15, 30, 60, 300, 900])
+        last_modified_days = rng.randint(0, 400)
+        funcs.append(ScannedResource(
+            resource_id=f"arn:aws:lambda:{region}:123456789012:function:{name}",
+            resource_type="Lambda",
+            region=region,
+            name=name,
+            state="Active",
+            tags={"Environment": "production"} if i % 3 != 0 else {},
+            raw_data={
                 "function_name": name,
-                "runtime": random.choice(_MOCK_RUNTIMES),
+                "runtime": rng.choice(_MOCK_RUNTIMES),
                 "memory_mb": memory_mb,
                 "timeout_sec": timeout_sec,
-                "code_size_bytes": random.randint(1024, 50_000_000),
+                "code_size_bytes": rng.randint(1024, 50_000_000),
                 "invocations_30d": invocations_30d,
                 "avg_duration_ms": avg_duration_ms,
                 "last_modified_days": last_modified_days,
-                "has_reserved_concurrency": random.random() > 0.8,
-                "has_dlq": random.random() > 0.6,
-                "tracing_enabled": random.random() > 0.5,
-                "vpc_configured": random.random() > 0.4,
+                "has_reserved_concurrency": rng.random() > 0.8,
+                "has_dlq": rng.random() > 0.6,
+                "tracing_enabled": rng.random() > 0.5,
+                "vpc_configured": rng.random() > 0.4,
             },
-        })
+        ))
     return funcs
 
 
-def scan_lambda(region: str) -> list[dict[str, Any]]:
-    """Scan Lambda functions in a region. Falls back to mock if boto3 unavailable."""
+@functools.lru_cache(maxsize=4096)
+def _cached_tags(region: str, function_arn: str, ttl_bucket: int) -> dict[str, str]:
+    from app.utils.aws_client_factory import get_client
+    return get_client("lambda", region).list_tags(Resource=function_arn).get("Tags", {})
+
+
+def _get_lambda_tags(region: str, function_arn: str) -> dict[str, str]:
+    """Tags for one function; failures are not cached and return an empty dict."""
+    try:
+        # A new bucket every _TAGS_TTL_SECONDS expires older entries
+        tags = _cached_tags(region, function_arn, int(time.monotonic() // _TAGS_TTL_SECONDS))
+    except Exception:
+        return {}
+    return dict(tags)
+
+
+def _enrich_function(
+    fn: dict[str, Any], invocations: int, region: str, now: datetime,
+) -> ScannedResource:
+    """Attach tags and last-modified age to one function and build its record."""
+    name = fn["FunctionName"]
+
+    tags = _get_lambda_tags(region, fn["FunctionArn"])
+
+    # Last modified in days
+    try:
+        lm = fn.get("LastModified", "")
+        lm_dt = parse_iso(lm) if lm else None
+        last_modified_days = (now - lm_dt).days if lm_dt else 0
+    except Exception:
+        last_modified_days = 0
+
+    return ScannedResource(
+        resource_id=fn["FunctionArn"],
+        resource_type="Lambda",
+        region=region,
+        name=name,
+        state=fn.get("State", "Active"),
+        tags=tags,
+        raw_data={
+            "function_name": name,
+            "runtime": fn.get("Runtime", "unknown"),
+            "memory_mb": fn.get("MemorySize", 128),
+            "timeout_sec": fn.get("Timeout", 3),
+            "code_size_bytes": fn.get("CodeSize", 0),
+            "invocations_30d": invocations,
+            "avg_duration_ms": 0,
+            "last_modified_days": last_modified_days,
+            "has_reserved_concurrency": False,
+            "has_dlq": bool(fn.get("DeadLetterConfig")),
+            "tracing_enabled": fn.get("TracingConfig", {}).get("Mode") == "Active",
+            "vpc_configured": bool(fn.get("VpcConfig", {}).get("VpcId")),
+        },
+    )
+
+
+def scan_lambda(region: str) -> Iterator[ScannedResource]:
+    """Scan Lambda functions in a region, yielding each one as its page is enriched.
+    Falls back to mock if boto3 is unavailable before anything was yielded."""
+    emitted = False
     try:
-        import boto3
         from app.core.config import get_settings
+        from app.services.scanner._metrics import batch_sums
+        from app.utils.aws_client_factory import get_client
         cfg = get_settings()
         if cfg.mock_aws:
-            return _mock_lambda(region)
+            yield from _mock_lambda(region)
+            return
 
-        session = boto3.Session(
-            aws_access_key_id=cfg.aws_access_key_id or None,
-            aws_secret_access_key=cfg.aws_secret_access_key or None,
-            region_name=region,
-        )
-        lambda_client = session.client("lambda", region_name=region)
-        cw_client = session.client("cloudwatch", region_name=region)
+        lambda_client = get_client("lambda", region)
 
         paginator = lambda_client.get_paginator("list_functions")
-        funcs = []
-        for page in paginator.paginate():
-            for fn in page.get("Functions", []):
-                name = fn["FunctionName"]
-                # CloudWatch invocation metrics (30d)
-                try:
-                    from datetime import timedelta
-                    resp = cw_client.get_metric_statistics(
-                        Namespace="AWS/Lambda",
-                        MetricName="Invocations",
-                        Dimensions=[{"Name": "FunctionName", "Value": name}],
-                        StartTime=datetime.now(timezone.utc) - timedelta(days=30),
-                        EndTime=datetime.now(timezone.utc),
-                        Period=2592000,  # 30 days
-                        Statistics=["Sum"],
-                    )
-                    invocations = int(sum(p["Sum"] for p in resp.get("Datapoints", [])))
-                except Exception:
-                    invocations = -1
-
-                # Tags
-                try:
-                    tags_resp = lambda_client.list_tags(Resource=fn["FunctionArn"])
-                    tags = tags_resp.get("Tags", {})
-                except Exception:
-                    tags = {}
-
-                # Last modified in days
-                try:
-                    lm = fn.get("LastModified", "")
-                    from datetime import timedelta
-                    lm_dt = datetime.fromisoformat(lm.replace("Z", "+00:00")) if lm else None
-                    last_modified_days = (datetime.now(timezone.utc) - lm_dt).days if lm_dt else 0
-                except Exception:
-                    last_modified_days = 0
-
-                funcs.append({
-                    "resource_id": fn["FunctionArn"],
-                    "resource_type": "Lambda",
-                    "region": region,
-                    "name": name,
-                    "state": fn.get("State", "Active"),
-                    "tags": tags,
-                    "raw_data": {
-                        "function_name": name,
-                        "runtime": fn.get("Runtime", "unknown"),
-                        "memory_mb": fn.get("MemorySize", 128),
-                        "timeout_sec": fn.get("Timeout", 3),
-                        "code_size_bytes": fn.get("CodeSize", 0),
-                        "invocations_30d": invocations,
-                        "avg_duration_ms": 0,
-                        "last_modified_days": last_modified_days,
-                        "has_reserved_concurrency": False,
-                        "has_dlq": bool(fn.get("DeadLetterConfig")),
-                        "tracing_enabled": fn.get("TracingConfig", {}).get("Mode") == "Active",
-                        "vpc_configured": bool(fn.get("VpcConfig", {}).get("VpcId")),
-                    },
-                })
-        return funcs
+        now = datetime.now(timezone.utc)
+        with ThreadPoolExecutor(max_workers=_ENRICH_WORKERS) as executor:
+            for page in paginator.paginate():
+                page_funcs = page.get("Functions", [])
+                # 30-day invocation totals for the whole page in batched GetMetricData calls
+                invocations_by_name = batch_sums(
+                    region, "AWS/Lambda", "Invocations",
+                    {fn["FunctionName"]: {"FunctionName": fn["FunctionName"]} for fn in page_funcs},
+                    days=30,
+                    now=now,
+                )
+                for record in executor.map(
+                    lambda fn: _enrich_function(
+                        fn,
+                        int(invocations_by_name.get(fn["FunctionName"], -1)),
+                        region,
+                        now,
+                    ),
+                    page_funcs,
+                ):
+                    emitted = True
+                    yield record
 
     except Exception as e:
+        if emitted:
+            logger.warning(f"Lambda scan for {region} aborted mid-stream: {e}")
+            return
         logger.warning(f"Lambda scan failed for {region}: {e} — using mock")
-        return _mock_lambda(region)
+        yield from _mock_lambda(region)
@@ -2,143 +2,191 @@ from __future__ import annotations
 
 import logging
 import random
-import uuid
-from datetime import datetime, timedelta, timezone
-from typing import Any
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Iterator
 
 from app.core.config import get_settings
+from app.services.scanner._metrics import get_metric_datapoints
+from app.services.scanner.resource import ScannedResource
 from app.utils.aws_client_factory import get_client
 
 logger = logging.getLogger(__name__)
 
-
-def _get_lb_request_count(lb_arn: str, region: str, period_days: int = 7) -> float:
+# Concurrent per-LB enrichment calls; stays below the client connection pool size
+_ENRICH_WORKERS = 16
+
+# DescribeTags accepts at most 20 ARNs per call
+_TAGS_BATCH_SIZE = 20
+
+# Load balancer states in which no traffic can have been served
+_NO_TRAFFIC_STATES = frozenset({"provisioning", "failed"})
+
+
+def _get_lb_metric(
+    lb_arn: str,
+    region: str,
+    namespace: str,
+    metric: str,
+    stat: str,
+    period_days: int,
+    now: datetime,
+) -> float | None:
+    """Single-period statistic for one load balancer; None when there is no data."""
+    dims = {"LoadBalancer": lb_arn.split("loadbalancer/")[-1]}
+    points = get_metric_datapoints(
+        region, {lb_arn: (namespace, metric, dims, stat)}, days=period_days, now=now,
+    )
+    if lb_arn not in points:
+        logger.debug("CloudWatch %s for %s failed", metric, lb_arn)
+    values = points.get(lb_arn)
+    return values[0][1] if values else None
+
+
+def _get_lb_request_count(lb_arn: str, region: str, now: datetime, period_days: int = 7) -> float:
     """Fetch average daily RequestCount from CloudWatch for an ALB/NLB."""
-    try:
-        cw = get_client("cloudwatch", region)
-        end = datetime.now(tz=timezone.utc)
-        start = end - timedelta(days=period_days)
-        resp = cw.get_metric_statistics(
-            Namespace="AWS/ApplicationELB",
-            MetricName="RequestCount",
-            Dimensions=[{"Name": "LoadBalancer", "Value": lb_arn.split("loadbalancer/")[-1]}],
-            StartTime=start,
-            EndTime=end,
-            Period=period_days * 86400,
-            Statistics=["Sum"],
-        )
-        points = resp.get("Datapoints", [])
-        if points:
-            total = sum(p["Sum"] for p in points)
-            return round(total / period_days, 2)
-    except Exception as exc:
-        logger.debug("CloudWatch RequestCount for %s failed: %s", lb_arn, exc)
-    return 0.0
-
-
-def _get_nlb_active_connections(lb_arn: str, region: str, period_days: int = 7) -> float:
+    total = _get_lb_metric(
+        lb_arn, region, "AWS/ApplicationELB", "RequestCount", "Sum", period_days, now,
+    )
+    return round(total / period_days, 2) if total is not None else 0.0
+
+
+def _get_nlb_active_connections(
+    lb_arn: str, region: str, now: datetime, period_days: int = 7,
+) -> float:
     """Fetch average ActiveFlowCount for NLB — used as proxy for request activity."""
-    try:
-        cw = get_client("cloudwatch", region)
-        end = datetime.now(tz=timezone.utc)
-        start = end - timedelta(days=period_days)
-        resp = cw.get_metric_statistics(
-            Namespace="AWS/NetworkELB",
-            MetricName="ActiveFlowCount",
-            Dimensions=[{"Name": "LoadBalancer", "Value": lb_arn.split("loadbalancer/")[-1]}],
-            StartTime=start,
-            EndTime=end,
-            Period=period_days * 86400,
-            Statistics=["Average"],
-        )
-        points = resp.get("Datapoints", [])
-        if points:
-            return round(points[0]["Average"], 2)
-    except Exception as exc:
-        logger.debug("CloudWatch ActiveFlowCount for %s failed: %s", lb_arn, exc)
-    return 0.0
-
-
-def _mock_lb_resources(region: str) -> list[dict[str, Any]]:
+    average = _get_lb_metric(
+        lb_arn, region, "AWS/NetworkELB", "ActiveFlowCount", "Average", period_days, now,
+    )
+    return round(average, 2) if average is not None else 0.0
+
+
+def _mock_lb_resources(region: str, count: int | None = None) -> list[ScannedResource]:
+    """
+    Build mock load balancers. ``count`` overrides the default 1–3 LBs for
+    load tests (names repeat past the four samples); random attributes are
+    drawn for the whole batch up front.
+    """
     names = ["api-gateway-alb", "internal-service-nlb", "prod-web-alb", "dev-alb"]
-    lb_types = ["ALB", "NLB"]
+    if count is None:
+        picked = random.sample(names, random.randint(1, 3))
+    else:
+        picked = [names[i % len(names)] for i in range(count)]
+    n = len(picked)
+    lb_types = random.choices(["ALB", "NLB"], k=n)
+    listener_counts = random.choices(range(3), k=n)
+    lb_states = random.choices(["active", "active", "provisioning"], k=n)
+    environments = random.choices(["production", "staging", ""], k=n)
+    owners = random.choices(["team-platform", ""], k=n)
+    schemes = random.choices(["internet-facing", "internal"], k=n)
+    dns_suffixes = random.choices(range(100000, 1000000), k=n)
+
     resources = []
-    for name in random.sample(names, random.randint(1, 3)):
-        lb_type = random.choice(lb_types)
-        listener_count = random.randint(0, 2)
-        avg_req = random.uniform(0, 500) if listener_count > 0 else 0.0
-        resources.append({
-            "resource_id": f"arn:aws:elasticloadbalancing:{region}:123456789012:loadbalancer/app/{name}/{uuid.uuid4().hex[:16]}",
-            "resource_type": "LB",
-            "region": region,
-            "name": name,
-            "state": random.choice(["active", "active", "provisioning"]),
-            "tags": {
-                "Environment": random.choice(["production", "staging", ""]),
-                "Owner": random.choice(["team-platform", ""]),
+    for i, name in enumerate(picked):
+        avg_req = random.uniform(0, 500) if listener_counts[i] > 0 else 0.0
+        resources.append(ScannedResource(
+            resource_id=(
+                f"arn:aws:elasticloadbalancing:{region}:123456789012:"
+                f"loadbalancer/app/{name}/{secrets.token_hex(8)}"
+            ),
+            resource_type="LB",
+            region=region,
+            name=name,
+            state=lb_states[i],
+            tags={
+                "Environment": environments[i],
+                "Owner": owners[i],
             },
-            "raw_data": {
-                "lb_type": lb_type,
-                "dns_name": f"{name}-{random.randint(100000, 999999)}.{region}.elb.amazonaws.com",
-                "listener_count": listener_count,
+            raw_data={
+                "lb_type": lb_types[i],
+                "dns_name": f"{name}-{dns_suffixes[i]}.{region}.elb.amazonaws.com",
+                "listener_count": listener_counts[i],
                 "avg_request_count_per_day": round(avg_req, 2),
-                "scheme": random.choice(["internet-facing", "internal"]),
+                "scheme": schemes[i],
             },
-        })
+        ))
     return resources
 
 
-def scan_lb(region: str) -> list[dict[str, Any]]:
-    """Scan ALBs and NLBs in the given region."""
+def _get_tags_by_arn(client: Any, lb_arns: list[str]) -> dict[str, dict[str, str]]:
+    """Fetch tags for many load balancers, 20 ARNs per DescribeTags call."""
+    tags_by_arn: dict[str, dict[str, str]] = {}
+    for offset in range(0, len(lb_arns), _TAGS_BATCH_SIZE):
+        chunk = lb_arns[offset: offset + _TAGS_BATCH_SIZE]
+        try:
+            tags_resp = client.describe_tags(ResourceArns=chunk)
+        except Exception as exc:
+            logger.debug("DescribeTags for %d load balancers failed: %s", len(chunk), exc)
+            continue
+        for tag_desc in tags_resp.get("TagDescriptions", []):
+            tags_by_arn[tag_desc["ResourceArn"]] = {
+                t["Key"]: t["Value"] for t in tag_desc.get("Tags", [])
+            }
+    return tags_by_arn
+
+
+def _enrich_lb(
+    client: Any, lb: dict[str, Any], tags: dict[str, str], region: str, now: datetime,
+) -> ScannedResource:
+    """Fetch listeners and traffic metrics for one load balancer."""
+    lb_arn = lb["LoadBalancerArn"]
+    lb_type_raw = lb.get("Type", "application").lower()
+    lb_type = "ALB" if lb_type_raw == "application" else "NLB"
+
+    try:
+        listeners_resp = client.describe_listeners(LoadBalancerArn=lb_arn)
+        listener_count = len(listeners_resp.get("Listeners", []))
+    except Exception:
+        listener_count = 0
+
+    state = lb.get("State", {}).get("Code", "unknown")
+
+    # LBs without listeners, still provisioning or failed cannot have served
+    # traffic; active_impaired ones still do, so their metrics are looked up
+    if listener_count == 0 or state in _NO_TRAFFIC_STATES:
+        avg_req = 0.0
+    elif lb_type == "ALB":
+        avg_req = _get_lb_request_count(lb_arn, region, now)
+    else:
+        avg_req = _get_nlb_active_connections(lb_arn, region, now)
+
+    return ScannedResource(
+        resource_id=lb_arn,
+        resource_type="LB",
+        region=region,
+        name=lb.get("LoadBalancerName"),
+        state=state,
+        tags=tags,
+        raw_data={
+            "lb_type": lb_type,
+            "dns_name": lb.get("DNSName"),
+            "listener_count": listener_count,
+            "avg_request_count_per_day": avg_req,
+            "scheme": lb.get("Scheme"),
+        },
+    )
+
+
+def scan_lb(region: str) -> Iterator[ScannedResource]:
+    """Scan ALBs and NLBs in the given region, yielding each page as it is enriched."""
     settings = get_settings()
     if settings.mock_aws:
-        return _mock_lb_resources(region)
+        yield from _mock_lb_resources(region)
+        return
 
     client = get_client("elbv2", region)
-    resources = []
     paginator = client.get_paginator("describe_load_balancers")
-
-    for page in paginator.paginate():
-        for lb in page.get("LoadBalancers", []):
-            lb_arn = lb["LoadBalancerArn"]
-            lb_type_raw = lb.get("Type", "application").lower()
-            lb_type = "ALB" if lb_type_raw == "application" else "NLB"
-
-            try:
-                tags_resp = client.describe_tags(ResourceArns=[lb_arn])
-                tags = {
-                    t["Key"]: t["Value"]
-                    for tag_desc in tags_resp.get("TagDescriptions", [])
-                    for t in tag_desc.get("Tags", [])
-                }
-            except Exception:
-                tags = {}
-
-            try:
-                listeners_resp = client.describe_listeners(LoadBalancerArn=lb_arn)
-                listener_count = len(listeners_resp.get("Listeners", []))
-            except Exception:
-                listener_count = 0
-
-            if lb_type == "ALB":
-                avg_req = _get_lb_request_count(lb_arn, region)
-            else:
-                avg_req = _get_nlb_active_connections(lb_arn, region)
-
-            resources.append({
-                "resource_id": lb_arn,
-                "resource_type": "LB",
-                "region": region,
-                "name": lb.get("LoadBalancerName"),
-                "state": lb.get("State", {}).get("Code", "unknown"),
-                "tags": tags,
-                "raw_data": {
-                    "lb_type": lb_type,
-                    "dns_name": lb.get("DNSName"),
-                    "listener_count": listener_count,
-                    "avg_request_count_per_day": avg_req,
-                    "scheme": lb.get("Scheme"),
-                },
-            })
-
-    return resources
+    now = datetime.now(tz=timezone.utc)
+
+    # boto3 clients are thread-safe, so one client serves every worker
+    with ThreadPoolExecutor(max_workers=_ENRICH_WORKERS) as executor:
+        for page in paginator.paginate():
+            lbs = page.get("LoadBalancers", [])
+            tags_by_arn = _get_tags_by_arn(client, [lb["LoadBalancerArn"] for lb in lbs])
+            yield from executor.map(
+                lambda lb: _enrich_lb(
+                    client, lb, tags_by_arn.get(lb["LoadBalancerArn"], {}), region, now,
+                ),
+                lbs,
+            )
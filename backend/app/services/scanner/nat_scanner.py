@@ -3,39 +3,54 @@ from __future__ import annotations
 import logging
 import random
 import uuid
-from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Any
 
 from app.core.config import get_settings
+from app.services.scanner._metrics import batch_sums
+from app.services.scanner._prefetch import prefetched
+from app.services.scanner.resource import RawData
 from app.utils.aws_client_factory import get_client
 
 logger = logging.getLogger(__name__)
 
+_KEY = itemgetter("Key")
+_VALUE = itemgetter("Value")
+
+
+def _tag_map(tags: list[dict]) -> dict[str, str]:
+    return dict(zip(map(_KEY, tags), map(_VALUE, tags)))
+
+
+@dataclass(slots=True, frozen=True)
+class NATRawData(RawData):
+    vpc_id: str | None
+    subnet_id: str | None
+    data_transfer_gb: float
+    connectivity_type: str
+    allocation_id: str | None
+
+
 _BYTES_PER_GB = 1024 ** 3
 
 
-def _get_nat_data_transfer_gb(nat_id: str, region: str, period_days: int = 7) -> float:
-    """Fetch total bytes out from NAT Gateway via CloudWatch over the past N days."""
-    try:
-        cw = get_client("cloudwatch", region)
-        end = datetime.now(tz=timezone.utc)
-        start = end - timedelta(days=period_days)
-        resp = cw.get_metric_statistics(
-            Namespace="AWS/NATGateway",
-            MetricName="BytesOutToDestination",
-            Dimensions=[{"Name": "NatGatewayId", "Value": nat_id}],
-            StartTime=start,
-            EndTime=end,
-            Period=period_days * 86400,
-            Statistics=["Sum"],
-        )
-        points = resp.get("Datapoints", [])
-        if points:
-            total_bytes = sum(p["Sum"] for p in points)
-            return round(total_bytes / _BYTES_PER_GB, 4)
-    except Exception as exc:
-        logger.debug("CloudWatch BytesOutToDestination for %s failed: %s", nat_id, exc)
-    return 0.0
+def _batch_fetch_nat_data_transfer_gb(
+    nat_ids: list[str], region: str, now: datetime, period_days: int = 7,
+) -> dict[str, float]:
+    """
+    Total bytes out (in GB) per NAT Gateway over the past N days, fetched for all
+    gateways in batched GetMetricData calls. Gateways whose lookup failed are
+    reported as 0.0, as before.
+    """
+    totals = batch_sums(
+        region, "AWS/NATGateway", "BytesOutToDestination",
+        {nat_id: {"NatGatewayId": nat_id} for nat_id in nat_ids},
+        days=period_days,
+        now=now,
+    )
+    return {nat_id: round(totals.get(nat_id, 0.0) / _BYTES_PER_GB, 4) for nat_id in nat_ids}
 
 
 def _mock_nat_resources(region: str) -> list[dict[str, Any]]:
@@ -53,13 +68,13 @@ def _mock_nat_resources(region: str) -> list[dict[str, Any]]:
                 "Environment": random.choice(["production", "staging", ""]),
                 "Owner": random.choice(["team-platform", ""]),
             },
-            "raw_data": {
-                "vpc_id": random.choice(vpc_ids),
-                "subnet_id": f"subnet-{uuid.uuid4().hex[:8]}",
-                "data_transfer_gb": data_gb,
-                "connectivity_type": random.choice(["public", "private"]),
-                "allocation_id": f"eipalloc-{uuid.uuid4().hex[:17]}",
-            },
+            "raw_data": NATRawData(
+                vpc_id=random.choice(vpc_ids),
+                subnet_id=f"subnet-{uuid.uuid4().hex[:8]}",
+                data_transfer_gb=data_gb,
+                connectivity_type=random.choice(["public", "private"]),
+                allocation_id=f"eipalloc-{uuid.uuid4().hex[:17]}",
+            ),
         })
     return resources
 
@@ -71,38 +86,43 @@ def scan_nat(region: str) -> list[dict[str, Any]]:
         return _mock_nat_resources(region)
 
     client = get_client("ec2", region)
-    resources = []
     paginator = client.get_paginator("describe_nat_gateways")
+    gateways = [
+        nat
+        for page in prefetched(paginator.paginate(
+            Filters=[{"Name": "state", "Values": ["available", "pending", "deleting"]}]
+        ))
+        for nat in page.get("NatGateways", [])
+    ]
+    data_gb_by_id = _batch_fetch_nat_data_transfer_gb(
+        [nat["NatGatewayId"] for nat in gateways], region, datetime.now(tz=timezone.utc),
+    )
 
-    for page in paginator.paginate(
-        Filters=[{"Name": "state", "Values": ["available", "pending", "deleting"]}]
-    ):
-        for nat in page.get("NatGateways", []):
-            nat_id = nat["NatGatewayId"]
-            tags = {t["Key"]: t["Value"] for t in nat.get("Tags", [])}
-            name = tags.get("Name", nat_id)
-
-            # Connectivity type: public (has EIP) or private
-            addresses = nat.get("NatGatewayAddresses", [])
-            allocation_id = addresses[0].get("AllocationId") if addresses else None
-            connectivity_type = nat.get("ConnectivityType", "public")
-
-            data_gb = _get_nat_data_transfer_gb(nat_id, region)
-
-            resources.append({
-                "resource_id": nat_id,
-                "resource_type": "NAT",
-                "region": region,
-                "name": name,
-                "state": nat.get("State"),
-                "tags": tags,
-                "raw_data": {
-                    "vpc_id": nat.get("VpcId"),
-                    "subnet_id": nat.get("SubnetId"),
-                    "data_transfer_gb": data_gb,
-                    "connectivity_type": connectivity_type,
-                    "allocation_id": allocation_id,
-                },
-            })
+    resources = []
+    for nat in gateways:
+        nat_id = nat["NatGatewayId"]
+        tags = _tag_map(nat.get("Tags", []))
+        name = tags.get("Name", nat_id)
+
+        # Connectivity type: public (has EIP) or private
+        addresses = nat.get("NatGatewayAddresses", [])
+        allocation_id = addresses[0].get("AllocationId") if addresses else None
+        connectivity_type = nat.get("ConnectivityType", "public")
+
+        resources.append({
+            "resource_id": nat_id,
+            "resource_type": "NAT",
+            "region": region,
+            "name": name,
+            "state": nat.get("State"),
+            "tags": tags,
+            "raw_data": NATRawData(
+                vpc_id=nat.get("VpcId"),
+                subnet_id=nat.get("SubnetId"),
+                data_transfer_gb=data_gb_by_id[nat_id],
+                connectivity_type=connectivity_type,
+                allocation_id=allocation_id,
+            ),
+        })
 
     return resources
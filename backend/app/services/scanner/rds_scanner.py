@@ -2,42 +2,73 @@ from __future__ import annotations
 
 import random
 import uuid
-from datetime import datetime, timedelta, timezone
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Any
 
 from app.core.config import get_settings
+from app.services.scanner._metrics import get_metric_datapoints
+from app.services.scanner._prefetch import prefetched
+from app.services.scanner.resource import RawData
 from app.utils.aws_client_factory import get_client
 
 # Over-provisioned RDS classes — flag if CPU is low
-_LARGE_DB_CLASSES = {
+_LARGE_DB_CLASSES = frozenset({
     "db.r5.xlarge", "db.r5.2xlarge", "db.r5.4xlarge", "db.r5.8xlarge",
     "db.r6g.xlarge", "db.r6g.2xlarge", "db.r6g.4xlarge",
     "db.m5.xlarge", "db.m5.2xlarge", "db.m5.4xlarge",
     "db.m6g.xlarge", "db.m6g.2xlarge",
-}
-
-
-def _get_rds_metric(db_id: str, region: str, metric: str, stat: str = "Average", period_days: int = 7) -> float:
-    """Fetch a single CloudWatch RDS metric average over the last N days."""
-    try:
-        cw = get_client("cloudwatch", region)
-        end = datetime.now(tz=timezone.utc)
-        start = end - timedelta(days=period_days)
-        resp = cw.get_metric_statistics(
-            Namespace="AWS/RDS",
-            MetricName=metric,
-            Dimensions=[{"Name": "DBInstanceIdentifier", "Value": db_id}],
-            StartTime=start,
-            EndTime=end,
-            Period=period_days * 86400,
-            Statistics=[stat],
-        )
-        points = resp.get("Datapoints", [])
-        if points:
-            return round(points[0][stat], 2)
-    except Exception:
-        pass
-    return 0.0
+})
+
+
+_METRIC_PERIOD_DAYS = 7
+
+_KEY = itemgetter("Key")
+_VALUE = itemgetter("Value")
+
+
+def _tag_map(tags: list[dict]) -> dict[str, str]:
+    return dict(zip(map(_KEY, tags), map(_VALUE, tags)))
+
+
+@dataclass(slots=True, frozen=True)
+class RDSRawData(RawData):
+    engine: str | None
+    engine_version: str | None
+    instance_class: str | None
+    multi_az: bool
+    storage_encrypted: bool
+    publicly_accessible: bool
+    allocated_storage_gb: int
+    max_allocated_storage_gb: int
+    storage_autoscaling_enabled: bool
+    avg_cpu_percent: float
+    avg_connections: float
+
+
+def _batch_fetch_rds_metrics(
+    db_ids: list[str], region: str, now: datetime,
+) -> dict[str, tuple[float, float]]:
+    """
+    Average CPU and connection count over the last week for each DB instance,
+    fetched in one batched GetMetricData pass. Missing data maps to 0.0.
+    """
+    queries = {
+        (db_id, metric): ("AWS/RDS", metric, {"DBInstanceIdentifier": db_id}, "Average")
+        for db_id in db_ids
+        for metric in ("CPUUtilization", "DatabaseConnections")
+    }
+    datapoints = get_metric_datapoints(region, queries, days=_METRIC_PERIOD_DAYS, now=now)
+
+    def _value(db_id: str, metric: str) -> float:
+        points = datapoints.get((db_id, metric))
+        return round(points[0][1], 2) if points else 0.0
+
+    return {
+        db_id: (_value(db_id, "CPUUtilization"), _value(db_id, "DatabaseConnections"))
+        for db_id in db_ids
+    }
 
 
 def _mock_rds_resources(region: str) -> list[dict[str, Any]]:
@@ -65,19 +96,19 @@ def _mock_rds_resources(region: str) -> list[dict[str, Any]]:
                 "Environment": random.choice(["production", "staging", ""]),
                 "Owner": random.choice(["team-backend", ""]),
             },
-            "raw_data": {
-                "engine": engine,
-                "engine_version": "15.3" if "postgres" in engine else "8.0.28",
-                "instance_class": instance_class,
-                "multi_az": random.choice([True, False]),
-                "storage_encrypted": random.choice([True, True, False]),
-                "publicly_accessible": random.choice([False, False, True]),
-                "allocated_storage_gb": allocated_gb,
-                "max_allocated_storage_gb": max_allocated_gb,
-                "storage_autoscaling_enabled": max_allocated_gb > allocated_gb,
-                "avg_cpu_percent": round(avg_cpu, 2),
-                "avg_connections": round(avg_connections, 2),
-            },
+            "raw_data": RDSRawData(
+                engine=engine,
+                engine_version="15.3" if "postgres" in engine else "8.0.28",
+                instance_class=instance_class,
+                multi_az=random.choice([True, False]),
+                storage_encrypted=random.choice([True, True, False]),
+                publicly_accessible=random.choice([False, False, True]),
+                allocated_storage_gb=allocated_gb,
+                max_allocated_storage_gb=max_allocated_gb,
+                storage_autoscaling_enabled=max_allocated_gb > allocated_gb,
+                avg_cpu_percent=round(avg_cpu, 2),
+                avg_connections=round(avg_connections, 2),
+            ),
         })
     return resources
 
@@ -90,28 +121,27 @@ def scan_rds(region: str) -> list[dict[str, Any]]:
     client = get_client("rds", region)
     paginator = client.get_paginator("describe_db_instances")
     resources = []
+    # One metrics window for every page of this scan
+    now = datetime.now(tz=timezone.utc)
 
-    for page in paginator.paginate():
+    for page in prefetched(paginator.paginate()):
+        # CloudWatch metrics for running instances only, batched per page
+        metrics = _batch_fetch_rds_metrics(
+            [db["DBInstanceIdentifier"] for db in page["DBInstances"]
+             if db.get("DBInstanceStatus") == "available"],
+            region,
+            now,
+        )
         for db in page["DBInstances"]:
             db_id = db["DBInstanceIdentifier"]
-            try:
-                tags_resp = client.list_tags_for_resource(
-                    ResourceName=db.get("DBInstanceArn", "")
-                )
-                tags = {t["Key"]: t["Value"] for t in tags_resp.get("TagList", [])}
-            except Exception:
-                tags = {}
+            # DescribeDBInstances already returns each instance's tags
+            tags = _tag_map(db.get("TagList", []))
 
             allocated_gb = db.get("AllocatedStorage", 0)
             max_allocated_gb = db.get("MaxAllocatedStorage", allocated_gb)
 
-            # CloudWatch metrics for running instances only
             db_state = db.get("DBInstanceStatus")
-            avg_cpu = 0.0
-            avg_connections = 0.0
-            if db_state == "available":
-                avg_cpu = _get_rds_metric(db_id, region, "CPUUtilization")
-                avg_connections = _get_rds_metric(db_id, region, "DatabaseConnections")
+            avg_cpu, avg_connections = metrics.get(db_id, (0.0, 0.0))
 
             resources.append({
                 "resource_id": db_id,
@@ -120,18 +150,18 @@ def scan_rds(region: str) -> list[dict[str, Any]]:
                 "name": db_id,
                 "state": db_state,
                 "tags": tags,
-                "raw_data": {
-                    "engine": db.get("Engine"),
-                    "engine_version": db.get("EngineVersion"),
-                    "instance_class": db.get("DBInstanceClass"),
-                    "multi_az": db.get("MultiAZ", False),
-                    "storage_encrypted": db.get("StorageEncrypted", False),
-                    "publicly_accessible": db.get("PubliclyAccessible", False),
-                    "allocated_storage_gb": allocated_gb,
-                    "max_allocated_storage_gb": max_allocated_gb,
-                    "storage_autoscaling_enabled": max_allocated_gb > allocated_gb,
-                    "avg_cpu_percent": avg_cpu,
-                    "avg_connections": avg_connections,
-                },
+                "raw_data": RDSRawData(
+                    engine=db.get("Engine"),
+                    engine_version=db.get("EngineVersion"),
+                    instance_class=db.get("DBInstanceClass"),
+                    multi_az=db.get("MultiAZ", False),
+                    storage_encrypted=db.get("StorageEncrypted", False),
+                    publicly_accessible=db.get("PubliclyAccessible", False),
+                    allocated_storage_gb=allocated_gb,
+                    max_allocated_storage_gb=max_allocated_gb,
+                    storage_autoscaling_enabled=max_allocated_gb > allocated_gb,
+                    avg_cpu_percent=avg_cpu,
+                    avg_connections=avg_connections,
+                ),
             })
     return resources
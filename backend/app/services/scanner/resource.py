@@ -0,0 +1,71 @@
+"""
+Resource records emitted by the scanners.
+
+A slotted dataclass is smaller than the equivalent dict and avoids building a
+fresh hash table per resource while the rule engines walk a scan. ``get``,
+item access and ``in`` are kept so the rule engines and governance checks can
+treat it like the plain resource dicts other scanners still return; the scan
+orchestrator calls ``to_dict`` before results are stored or serialised.
+
+``RawData`` does the same for the per-type ``raw_data`` records some scanners
+build in place of a nested dict.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass(slots=True)
+class ScannedResource:
+    resource_id: str
+    resource_type: str
+    region: str
+    name: str | None
+    state: str
+    tags: dict[str, str] = field(default_factory=dict)
+    raw_data: dict[str, Any] = field(default_factory=dict)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class RawData:
+    """
+    Base for slotted per-type ``raw_data`` records. Supports the read-only
+    mapping operations the rule engines use (``get``, item access, ``in``
+    and ``**`` unpacking); ``to_dict`` gives the plain dict that is stored.
+    """
+    __slots__ = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.__slots__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.__slots__
+
+    def keys(self) -> tuple[str, ...]:
+        return self.__slots__
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
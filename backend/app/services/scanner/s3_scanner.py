@@ -3,75 +3,95 @@ from __future__ import annotations
 import logging
 import random
 import uuid
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Any
 
 from app.core.config import get_settings
+from app.services.scanner._metrics import MetricQuery, get_metric_datapoints
+from app.services.scanner.resource import RawData
 from app.utils.aws_client_factory import get_client
 
 logger = logging.getLogger(__name__)
 
+# Concurrent per-bucket config lookups; stays below the client connection pool size
+_CONFIG_WORKERS = 16
 
-def _get_s3_cw_metric(bucket_name: str, region: str, metric_name: str, storage_type: str) -> float:
-    """Fetch a CloudWatch S3 metric (BucketSizeBytes or NumberOfObjects) for a bucket.
-    Returns 0.0 on failure."""
-    try:
-        cw = get_client("cloudwatch", region or "us-east-1")
-        end = datetime.now(tz=timezone.utc)
-        start = end - timedelta(days=3)  # S3 metrics are daily; 3-day window is sufficient
-        resp = cw.get_metric_statistics(
-            Namespace="AWS/S3",
-            MetricName=metric_name,
-            Dimensions=[
-                {"Name": "BucketName", "Value": bucket_name},
-                {"Name": "StorageType", "Value": storage_type},
-            ],
-            StartTime=start,
-            EndTime=end,
-            Period=86400,
-            Statistics=["Average"],
-        )
-        points = sorted(resp.get("Datapoints", []), key=lambda p: p["Timestamp"], reverse=True)
-        if points:
-            return float(points[0]["Average"])
-    except Exception as exc:
-        logger.debug("CloudWatch metric %s for %s failed: %s", metric_name, bucket_name, exc)
-    return 0.0
+_KEY = itemgetter("Key")
+_VALUE = itemgetter("Value")
 
 
-def _get_s3_size_and_count(bucket_name: str, region: str) -> tuple[float, int]:
-    """Return (size_gb, object_count) for a bucket via CloudWatch."""
-    size_bytes = _get_s3_cw_metric(bucket_name, region, "BucketSizeBytes", "StandardStorage")
-    size_gb = round(size_bytes / (1024 ** 3), 3)
-    object_count = int(_get_s3_cw_metric(bucket_name, region, "NumberOfObjects", "AllStorageTypes"))
-    return size_gb, object_count
+def _tag_map(tags: list[dict]) -> dict[str, str]:
+    return dict(zip(map(_KEY, tags), map(_VALUE, tags)))
 
 
-def _get_s3_last_accessed_days(bucket_name: str, region: str) -> int:
-    """Estimate days since last access using CloudWatch S3 BucketSizeBytes.
-    Returns 0 if we cannot determine (error or no data)."""
-    try:
-        cw = get_client("cloudwatch", region or "us-east-1")
-        end = datetime.now(tz=timezone.utc)
-        resp = cw.get_metric_statistics(
-            Namespace="AWS/S3",
-            MetricName="BucketSizeBytes",
-            Dimensions=[
-                {"Name": "BucketName", "Value": bucket_name},
-                {"Name": "StorageType", "Value": "StandardStorage"},
-            ],
-            StartTime=end.replace(day=1, hour=0, minute=0, second=0),
-            EndTime=end,
-            Period=86400,
-            Statistics=["Average"],
+@dataclass(slots=True, frozen=True)
+class S3RawData(RawData):
+    public_access_blocked: bool
+    versioning_enabled: bool
+    encryption_enabled: bool
+    has_lifecycle_policy: bool
+    last_accessed_days: int
+    size_gb: float
+    object_count: int
+
+
+# S3 storage metrics are reported once a day. The window covers this month so far,
+# but never less than 3 days so the latest datapoint is always included.
+_MIN_WINDOW_DAYS = 3
+
+
+def _batch_fetch_s3_metrics(
+    bucket_names: list[str], region: str, now: datetime,
+) -> dict[str, tuple[float, int, int]]:
+    """
+    Return {bucket: (size_gb, object_count, last_accessed_days)} for every
+    bucket from batched GetMetricData calls. Missing data maps to zeros.
+
+    last_accessed_days estimates days since the newest BucketSizeBytes
+    datapoint this month; it is read off the same size series rather than a
+    second query.
+    """
+    queries: dict[Any, MetricQuery] = {}
+    for name in bucket_names:
+        queries[(name, "size")] = (
+            "AWS/S3", "BucketSizeBytes",
+            {"BucketName": name, "StorageType": "StandardStorage"}, "Average",
+        )
+        queries[(name, "count")] = (
+            "AWS/S3", "NumberOfObjects",
+            {"BucketName": name, "StorageType": "AllStorageTypes"}, "Average",
         )
-        points = sorted(resp.get("Datapoints", []), key=lambda p: p["Timestamp"], reverse=True)
-        if points:
-            last_ts = points[0]["Timestamp"].replace(tzinfo=timezone.utc)
-            return max(0, (end - last_ts).days)
+    datapoints = get_metric_datapoints(
+        region, queries, days=max(now.day, _MIN_WINDOW_DAYS), period=86400, now=now,
+    )
+
+    metrics: dict[str, tuple[float, int, int]] = {}
+    for name in bucket_names:
+        size_points = datapoints.get((name, "size"))
+        count_points = datapoints.get((name, "count"))
+        size_gb = 0.0
+        last_accessed_days = 0
+        if size_points:
+            last_ts, size_bytes = size_points[0]
+            size_gb = round(size_bytes / (1024 ** 3), 3)
+            last_accessed_days = max(0, (now - last_ts.replace(tzinfo=timezone.utc)).days)
+        object_count = int(count_points[0][1]) if count_points else 0
+        metrics[name] = (size_gb, object_count, last_accessed_days)
+    return metrics
+
+
+def _bucket_region(client: Any, name: str, default: str) -> str:
+    """Home region of a bucket. GetBucketLocation reports us-east-1 as None, eu-west-1 as "EU"."""
+    try:
+        location = client.get_bucket_location(Bucket=name).get("LocationConstraint")
     except Exception:
-        pass
-    return 0
+        return default
+    if not location:
+        return "us-east-1"
+    return "eu-west-1" if location == "EU" else location
 
 
 def _mock_s3_resources(region: str) -> list[dict[str, Any]]:
@@ -92,19 +112,60 @@ def _mock_s3_resources(region: str) -> list[dict[str, Any]]:
                 "Environment": random.choice(["production", "staging", ""]),
                 "Owner": random.choice(["team-platform", ""]),
             },
-            "raw_data": {
-                "public_access_blocked": random.choice([True, True, False]),
-                "versioning_enabled": random.choice([True, False]),
-                "encryption_enabled": random.choice([True, True, False]),
-                "has_lifecycle_policy": random.choice([True, False]),
-                "size_gb": random.randint(1, 5000),
-                "object_count": random.randint(100, 1_000_000),
-                "last_accessed_days": last_accessed_days,
-            },
+            "raw_data": S3RawData(
+                public_access_blocked=random.choice([True, True, False]),
+                versioning_enabled=random.choice([True, False]),
+                encryption_enabled=random.choice([True, True, False]),
+                has_lifecycle_policy=random.choice([True, False]),
+                size_gb=random.randint(1, 5000),
+                object_count=random.randint(100, 1_000_000),
+                last_accessed_days=last_accessed_days,
+            ),
         })
     return resources
 
 
+def _fetch_bucket_config(client: Any, name: str) -> dict[str, Any]:
+    """Run the five per-bucket configuration lookups for one bucket."""
+    try:
+        pab = client.get_public_access_block(Bucket=name)
+        public_blocked = all(pab["PublicAccessBlockConfiguration"].values())
+    except Exception:
+        public_blocked = False
+
+    try:
+        versioning = client.get_bucket_versioning(Bucket=name)
+        versioning_enabled = versioning.get("Status") == "Enabled"
+    except Exception:
+        versioning_enabled = False
+
+    try:
+        enc = client.get_bucket_encryption(Bucket=name)
+        encryption_enabled = bool(enc.get("ServerSideEncryptionConfiguration"))
+    except Exception:
+        encryption_enabled = False
+
+    try:
+        lc = client.get_bucket_lifecycle_configuration(Bucket=name)
+        has_lifecycle_policy = bool(lc.get("Rules"))
+    except Exception:
+        has_lifecycle_policy = False
+
+    try:
+        tags_resp = client.get_bucket_tagging(Bucket=name)
+        tags = _tag_map(tags_resp.get("TagSet", []))
+    except Exception:
+        tags = {}
+
+    return {
+        "tags": tags,
+        "public_access_blocked": public_blocked,
+        "versioning_enabled": versioning_enabled,
+        "encryption_enabled": encryption_enabled,
+        "has_lifecycle_policy": has_lifecycle_policy,
+    }
+
+
 def scan_s3(region: str) -> list[dict[str, Any]]:
     settings = get_settings()
     if settings.mock_aws:
@@ -114,56 +175,41 @@ def scan_s3(region: str) -> list[dict[str, Any]]:
     resources = []
 
     buckets = client.list_buckets().get("Buckets", [])
-    for bucket in buckets:
-        name = bucket["Name"]
-        try:
-            pab = client.get_public_access_block(Bucket=name)
-            public_blocked = all(pab["PublicAccessBlockConfiguration"].values())
-        except Exception:
-            public_blocked = False
-
-        try:
-            versioning = client.get_bucket_versioning(Bucket=name)
-            versioning_enabled = versioning.get("Status") == "Enabled"
-        except Exception:
-            versioning_enabled = False
-
-        try:
-            enc = client.get_bucket_encryption(Bucket=name)
-            encryption_enabled = bool(enc.get("ServerSideEncryptionConfiguration"))
-        except Exception:
-            encryption_enabled = False
-
-        try:
-            lc = client.get_bucket_lifecycle_configuration(Bucket=name)
-            has_lifecycle_policy = bool(lc.get("Rules"))
-        except Exception:
-            has_lifecycle_policy = False
-
-        try:
-            tags_resp = client.get_bucket_tagging(Bucket=name)
-            tags = {t["Key"]: t["Value"] for t in tags_resp.get("TagSet", [])}
-        except Exception:
-            tags = {}
-
-        last_accessed_days = _get_s3_last_accessed_days(name, region)
-        size_gb, object_count = _get_s3_size_and_count(name, region)
-
-        resources.append({
-            "resource_id": name,
-            "resource_type": "S3",
-            "region": region,
-            "name": name,
-            "state": "active",
-            "tags": tags,
-            "raw_data": {
-                "public_access_blocked": public_blocked,
-                "versioning_enabled": versioning_enabled,
-                "encryption_enabled": encryption_enabled,
-                "has_lifecycle_policy": has_lifecycle_policy,
-                "last_accessed_days": last_accessed_days,
-                "size_gb": size_gb,
-                "object_count": object_count,
-            },
-        })
+    names = [b["Name"] for b in buckets]
+
+    # Per-bucket calls are independent round-trips; the client is thread-safe
+    with ThreadPoolExecutor(max_workers=_CONFIG_WORKERS) as executor:
+        # Bucket storage metrics are only published in the bucket's own region,
+        # so group buckets by home region and query each region once.
+        names_by_region: dict[str, list[str]] = {}
+        bucket_regions = executor.map(lambda n: _bucket_region(client, n, region), names)
+        for name, bucket_region in zip(names, bucket_regions):
+            names_by_region.setdefault(bucket_region, []).append(name)
+        now = datetime.now(tz=timezone.utc)
+        bucket_metrics: dict[str, tuple[float, int, int]] = {}
+        for bucket_region, region_names in names_by_region.items():
+            bucket_metrics.update(_batch_fetch_s3_metrics(region_names, bucket_region, now))
+
+        configs = executor.map(lambda name: _fetch_bucket_config(client, name), names)
+
+        for name, config in zip(names, configs):
+            size_gb, object_count, last_accessed_days = bucket_metrics[name]
+
+            resources.append({
+                "resource_id": name,
+                "resource_type": "S3",
+                "region": region,
+                "name": name,
+                "state": "active",
+                "tags": config["tags"],
+                "raw_data": S3RawData(
+                    public_access_blocked=config["public_access_blocked"],
+                    versioning_enabled=config["versioning_enabled"],
+                    encryption_enabled=config["encryption_enabled"],
+                    has_lifecycle_policy=config["has_lifecycle_policy"],
+                    last_accessed_days=last_accessed_days,
+                    size_gb=size_gb,
+                    object_count=object_count,
+                ),
+            })
     return resources
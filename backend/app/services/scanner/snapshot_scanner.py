@@ -5,14 +5,39 @@ Finds all owned snapshots and flags old ones (>30 days) not linked to an AMI.
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from operator import itemgetter
 from typing import Any
 
 from app.core.config import get_settings
+from app.services.scanner._prefetch import prefetched
+from app.services.scanner.resource import RawData
 from app.utils.aws_client_factory import get_client
 
 logger = logging.getLogger(__name__)
 
+_KEY = itemgetter("Key")
+_VALUE = itemgetter("Value")
+
+
+def _tag_map(tags: list[dict]) -> dict[str, str]:
+    return dict(zip(map(_KEY, tags), map(_VALUE, tags)))
+
+
+@dataclass(slots=True, frozen=True)
+class SnapshotRawData(RawData):
+    size_gb: int
+    age_days: int
+    ami_id: str | None
+    description: str
+    # Kept as the datetime boto3 returns; serialised to ISO 8601 when stored or sent
+    start_time: datetime | None
+
+
+_SNAPSHOT_PAGE_SIZE = 1000
+
 
 def _mock_snapshot_resources(region: str) -> list[dict[str, Any]]:
     return [
@@ -23,17 +48,32 @@ def _mock_snapshot_resources(region: str) -> list[dict[str, Any]]:
             "name": "old-backup",
             "state": "completed",
             "tags": {},
-            "raw_data": {
-                "size_gb": 50,
-                "age_days": 45,
-                "ami_id": None,
-                "description": "old-backup",
-                "start_time": "2024-12-01T00:00:00Z",
-            },
+            "raw_data": SnapshotRawData(
+                size_gb=50,
+                age_days=45,
+                ami_id=None,
+                description="old-backup",
+                start_time=datetime(2024, 12, 1, tzinfo=timezone.utc),
+            ),
         },
     ]
 
 
+def _ami_snapshot_ids(client: Any) -> set[str]:
+    """Snapshot IDs referenced by an owned AMI's block device mappings."""
+    ids: set[str] = set()
+    try:
+        ami_resp = client.describe_images(Owners=["self"])
+        for image in ami_resp.get("Images", []):
+            for mapping in image.get("BlockDeviceMappings", []):
+                snap = mapping.get("Ebs", {}).get("SnapshotId")
+                if snap:
+                    ids.add(snap)
+    except Exception:
+        pass
+    return ids
+
+
 def scan_snapshots(region: str) -> list[dict[str, Any]]:
     settings = get_settings()
     if settings.mock_aws:
@@ -43,42 +83,42 @@ def scan_snapshots(region: str) -> list[dict[str, Any]]:
     resources: list[dict[str, Any]] = []
 
     try:
-        # Collect all AMI snapshot IDs so we can flag orphaned snapshots
-        ami_snapshot_ids: set[str] = set()
-        try:
-            ami_resp = client.describe_images(Owners=["self"])
-            for image in ami_resp.get("Images", []):
-                for mapping in image.get("BlockDeviceMappings", []):
-                    snap = mapping.get("Ebs", {}).get("SnapshotId")
-                    if snap:
-                        ami_snapshot_ids.add(snap)
-        except Exception:
-            pass
-
+        # The AMI lookup and the snapshot pagination are independent, so the
+        # AMI call runs alongside the first snapshot pages; its result is only
+        # needed once the first page is being processed. Snapshot pages are
+        # fetched ahead on a background thread.
         paginator = client.get_paginator("describe_snapshots")
-        now = datetime.now(timezone.utc)
-        for page in paginator.paginate(OwnerIds=["self"]):
-            for snap in page.get("Snapshots", []):
-                tags = {t["Key"]: t["Value"] for t in snap.get("Tags", [])}
-                start_time = snap.get("StartTime")
-                age_days = int((now - start_time).days) if start_time else 0
-                snap_id = snap["SnapshotId"]
-                ami_id = snap_id if snap_id in ami_snapshot_ids else None
-                resources.append({
-                    "resource_id": snap_id,
-                    "resource_type": "SNAPSHOT",
-                    "region": region,
-                    "name": tags.get("Name", snap.get("Description", "")),
-                    "state": snap.get("State", "completed"),
-                    "tags": tags,
-                    "raw_data": {
-                        "size_gb": snap.get("VolumeSize", 0),
-                        "age_days": age_days,
-                        "ami_id": ami_id,
-                        "description": snap.get("Description", ""),
-                        "start_time": start_time.isoformat() if start_time else None,
-                    },
-                })
+        pages = prefetched(paginator.paginate(
+            OwnerIds=["self"], PaginationConfig={"PageSize": _SNAPSHOT_PAGE_SIZE},
+        ))
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            ami_future = executor.submit(_ami_snapshot_ids, client)
+            ami_snapshot_ids: set[str] | None = None
+            now = datetime.now(timezone.utc)
+            for page in pages:
+                if ami_snapshot_ids is None:
+                    ami_snapshot_ids = ami_future.result()
+                for snap in page.get("Snapshots", []):
+                    tags = _tag_map(snap.get("Tags", []))
+                    start_time = snap.get("StartTime")
+                    age_days = int((now - start_time).days) if start_time else 0
+                    snap_id = snap["SnapshotId"]
+                    ami_id = snap_id if snap_id in ami_snapshot_ids else None
+                    resources.append({
+                        "resource_id": snap_id,
+                        "resource_type": "SNAPSHOT",
+                        "region": region,
+                        "name": tags.get("Name", snap.get("Description", "")),
+                        "state": snap.get("State", "completed"),
+                        "tags": tags,
+                        "raw_data": SnapshotRawData(
+                            size_gb=snap.get("VolumeSize", 0),
+                            age_days=age_days,
+                            ami_id=ami_id,
+                            description=snap.get("Description", ""),
+                            start_time=start_time,
+                        ),
+                    })
     except Exception as e:
         logger.error(f"Snapshot scan failed in {region}: {e}")
 
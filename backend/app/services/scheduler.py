@@ -5,20 +5,23 @@ Reads cron expression from settings and triggers scans automatically.
 from __future__ import annotations
 
 import logging
+import uuid
+from datetime import datetime
 from typing import Any
 
+from app.api.routes.audit import _run_scan
+from app.core import store
+from app.core.config import get_settings
+
 logger = logging.getLogger(__name__)
 
 _scheduler = None
 
+_SCHEDULED_RESOURCE_TYPES = ("EC2", "EBS", "S3", "RDS", "EIP", "SNAPSHOT", "LB", "NAT")
+
 
 def _scheduled_scan() -> None:
     """Run a scan triggered by the scheduler."""
-    from app.core.config import get_settings
-    from app.core import store
-    import uuid
-    from datetime import datetime
-
     settings = get_settings()
     regions = (
         [r.strip() for r in settings.schedule_regions.split(",") if r.strip()]
@@ -33,7 +36,7 @@ def _scheduled_scan() -> None:
         "id": scan_id,
         "status": "pending",
         "regions": regions,
-        "resource_types": ["EC2", "EBS", "S3", "RDS", "EIP", "SNAPSHOT", "LB", "NAT"],
+        "resource_types": list(_SCHEDULED_RESOURCE_TYPES),
         "started_at": datetime.utcnow().isoformat(),
         "completed_at": None,
         "resource_count": 0,
@@ -41,16 +44,13 @@ def _scheduled_scan() -> None:
         "triggered_by": "scheduler",
     }
 
-    from app.api.routes.audit import _run_scan
-    _run_scan(scan_id, regions, ["EC2", "EBS", "S3", "RDS", "EIP", "SNAPSHOT", "LB", "NAT"])
+    _run_scan(scan_id, regions, list(_SCHEDULED_RESOURCE_TYPES))
     logger.info(f"[Scheduler] Scheduled scan {scan_id} complete")
 
 
 def start_scheduler() -> None:
     """Start APScheduler if a cron schedule is configured."""
     global _scheduler
-    from app.core.config import get_settings
-
     settings = get_settings()
     if not settings.schedule_cron:
         logger.info("No scan schedule configured — scheduler not started")
@@ -88,7 +88,6 @@ def stop_scheduler() -> None:
 
 def get_scheduler_status() -> dict[str, Any]:
     """Return scheduler status and next run time."""
-    from app.core.config import get_settings
     settings = get_settings()
 
     if not _scheduler or not _scheduler.running:
@@ -1,31 +1,114 @@
 from __future__ import annotations
 
 import logging
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import boto3
+import orjson
+from botocore import parsers
 from botocore.config import Config
 
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
 
 logger = logging.getLogger(__name__)
 
 
-# Retry configuration for all boto3 clients
+# Retry configuration for all boto3 clients. Adaptive mode rate-limits the
+# client itself once AWS starts throttling, so parallel scanners back off
+# instead of burning their retries.
 _BOTO_RETRY_CONFIG = Config(
-    retries={"max_attempts": 3, "mode": "adaptive"},
+    retries={"max_attempts": 10, "mode": "adaptive"},
     connect_timeout=10,
     read_timeout=30,
+    # Scanners fan per-resource calls out over a thread pool sharing one client
+    max_pool_connections=50,
+    tcp_keepalive=True,
 )
 
 
-def get_boto3_session(region: str | None = None) -> boto3.Session:
+_stdlib_parse_body_as_json = parsers.BaseJSONParser._parse_body_as_json
+_fast_json_lock = threading.Lock()
+
+
+def _orjson_parse_body_as_json(self: parsers.BaseJSONParser, body_contents: bytes) -> Any:
+    """orjson drop-in for botocore's JSON body parsing; defers to the stdlib on anything unusual."""
+    if not body_contents:
+        return {}
+    try:
+        return orjson.loads(body_contents)
+    except orjson.JSONDecodeError:
+        # e.g. integers beyond 64 bits, or a non-JSON error body
+        return _stdlib_parse_body_as_json(self, body_contents)
+
+
+def _configure_json_parser(enabled: bool) -> None:
     """
-    Build a boto3 session using the configured credential chain.
-    Reads settings fresh on every call so credentials set via the
-    Settings UI are immediately picked up without a restart.
+    Switch botocore's JSON-protocol parser (Lambda, CloudWatch Logs, …) to
+    orjson when ``fast_json_parsing`` is on. Query/XML services such as EC2
+    and IAM are unaffected. Toggling back restores the stdlib parser.
     """
-    settings = get_settings()   # ← always fresh, no module-level cache
+    target = _orjson_parse_body_as_json if enabled else _stdlib_parse_body_as_json
+    if parsers.BaseJSONParser._parse_body_as_json is not target:
+        with _fast_json_lock:
+            parsers.BaseJSONParser._parse_body_as_json = target
+
+
+# Cached clients are rebuilt this long before assumed-role credentials expire
+_CREDENTIAL_REFRESH_MARGIN = timedelta(minutes=5)
+
+# (service, region, credentials fingerprint) → (client, credentials expiry or None)
+_client_cache: dict[tuple[str, str, int], tuple[Any, datetime | None]] = {}
+_client_cache_lock = threading.Lock()
+
+
+def credentials_fingerprint(settings: Settings) -> int:
+    """
+    Identity of the configured AWS credentials. Caches of per-account data
+    (clients here, CloudWatch datapoints in the scanners) include it in their
+    keys so that changing credentials at runtime never serves stale results.
+    """
+    return hash((
+        settings.aws_access_key_id,
+        settings.aws_secret_access_key,
+        settings.aws_session_token,
+        settings.aws_role_arn,
+    ))
+
+
+# Last AssumeRole result: (credentials fingerprint, Credentials block)
+_role_credentials: tuple[int, dict[str, Any]] | None = None
+_role_credentials_lock = threading.Lock()
+
+
+def _assumed_role_credentials(session: boto3.Session, settings: Settings) -> dict[str, Any]:
+    """
+    Credentials for ``settings.aws_role_arn``, reused until shortly before
+    they expire. The lock is held across the STS call so concurrent scanner
+    threads wait for one refresh instead of each assuming the role.
+    """
+    global _role_credentials
+    fingerprint = credentials_fingerprint(settings)
+    with _role_credentials_lock:
+        if _role_credentials is not None:
+            cached_fingerprint, creds = _role_credentials
+            remaining = creds["Expiration"] - datetime.now(timezone.utc)
+            if cached_fingerprint == fingerprint and remaining > _CREDENTIAL_REFRESH_MARGIN:
+                return creds
+
+        logger.info("Assuming IAM role", extra={"role_arn": settings.aws_role_arn})
+        sts = session.client("sts")
+        creds = sts.assume_role(
+            RoleArn=settings.aws_role_arn,
+            RoleSessionName="CloudAuditScanner",
+        )["Credentials"]
+        _role_credentials = (fingerprint, creds)
+        return creds
+
+
+def _build_session(settings: Settings, region: str | None) -> tuple[boto3.Session, datetime | None]:
+    """Session for the configured credential chain, plus the expiry of assumed-role credentials."""
     effective_region = region or settings.aws_default_region
     kwargs: dict[str, Any] = {"region_name": effective_region}
 
@@ -38,26 +121,60 @@ def get_boto3_session(region: str | None = None) -> boto3.Session:
     session = boto3.Session(**kwargs)
 
     if settings.aws_role_arn:
-        logger.info("Assuming IAM role", extra={"role_arn": settings.aws_role_arn})
-        sts = session.client("sts")
-        creds = sts.assume_role(
-            RoleArn=settings.aws_role_arn,
-            RoleSessionName="CloudAuditScanner",
-        )["Credentials"]
+        creds = _assumed_role_credentials(session, settings)
         session = boto3.Session(
             aws_access_key_id=creds["AccessKeyId"],
             aws_secret_access_key=creds["SecretAccessKey"],
             aws_session_token=creds["SessionToken"],
             region_name=effective_region,
         )
+        return session, creds["Expiration"]
+
+    return session, None
+
 
-    return session
+def get_boto3_session(region: str | None = None) -> boto3.Session:
+    """
+    Build a boto3 session using the configured credential chain.
+    Reads settings fresh on every call so credentials set via the
+    Settings UI are immediately picked up without a restart.
+    """
+    settings = get_settings()   # ← always fresh, no module-level cache
+    return _build_session(settings, region)[0]
 
 
 def get_client(service: str, region: str | None = None) -> Any:
-    """Get a boto3 client for the given service and region with retry config."""
-    session = get_boto3_session(region)
-    return session.client(service, config=_BOTO_RETRY_CONFIG)
+    """Get a boto3 client for the given service and region with retry config.
+
+    Clients are thread-safe and expensive to build (session setup, service
+    model loading and, for roles, an STS round-trip), so they are reused
+    across scanner calls. The cache key includes a fingerprint of the
+    configured credentials, so keys saved via the Settings UI produce fresh
+    clients; assumed-role clients are rebuilt shortly before their
+    credentials expire.
+    """
+    settings = get_settings()
+    _configure_json_parser(settings.fast_json_parsing)
+    region = region or settings.aws_default_region
+    fingerprint = credentials_fingerprint(settings)
+    key = (service, region, fingerprint)
+
+    with _client_cache_lock:
+        cached = _client_cache.get(key)
+    if cached is not None:
+        client, expires_at = cached
+        remaining = None if expires_at is None else expires_at - datetime.now(timezone.utc)
+        if remaining is None or remaining > _CREDENTIAL_REFRESH_MARGIN:
+            return client
+
+    session, expires_at = _build_session(settings, region)
+    client = session.client(service, config=_BOTO_RETRY_CONFIG)
+    with _client_cache_lock:
+        # Clients built for credentials that have since changed are dead weight
+        for stale in [k for k in _client_cache if k[2] != fingerprint]:
+            del _client_cache[stale]
+        _client_cache[key] = (client, expires_at)
+    return client
 
 
 def get_resource_client(service: str, region: str | None = None) -> Any:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from datetime import datetime, timezone
 
 
@@ -11,6 +12,14 @@ def format_iso(dt: datetime) -> str:
     return dt.isoformat()
 
 
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts a trailing "Z" (and +HHMM offsets) from 3.11 on
+    parse_iso = datetime.fromisoformat
+else:
+    def parse_iso(value: str) -> datetime:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
 def days_between(start: datetime, end: datetime) -> int:
     return abs((end - start).days)
 
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import math
 from typing import Any
 
 
@@ -11,7 +10,7 @@ class Paginator:
         self.offset = (self.page - 1) * self.limit
 
     def paginate_result(self, total: int, items: list[Any]) -> dict[str, Any]:
-        pages = math.ceil(total / self.limit) if total > 0 else 1
+        pages = -(-total // self.limit) if total > 0 else 1
         return {
             "total": total,
             "page": self.page,
@@ -7,16 +7,30 @@ Usage:
     python scripts/report.py --output report.json    # save to file
     python scripts/report.py --slack                 # post to Slack (reads SLACK_WEBHOOK_URL)
     python scripts/report.py --slack https://hooks.slack.com/...  # explicit URL
+    python scripts/report.py --no-cache              # ignore any cached report
 
-Generates a JSON audit report from the in-memory scan store.
+Generates a JSON audit report from the in-memory scan store. Serialised
+reports are cached per scan in a private directory next to the scan data.
 """
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
+import gzip
+import hashlib
+import heapq
+import importlib.util
 import os
+import shutil
+import stat
 import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
+from typing import Any, BinaryIO
+
+import orjson
 
 # Add backend root to path so we can import app modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -24,54 +38,98 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from app.core import store  # noqa: E402 — must be after sys.path patch
 
 
-def build_report(scan_id: str | None = None) -> dict:
-    """Build a structured JSON audit report."""
-    # Determine which scan to use
+# Sort order for severities; anything unrecognised sorts last
+_SEV_RANK = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
+
+# Raw severity value → upper-cased, interned name. Scans loaded from disk
+# carry their own string objects (and occasionally lower-case labels).
+_SEVERITY_NAMES: dict[str | None, str] = {}
+
+
+def _severity_name(raw: str | None) -> str:
+    name = _SEVERITY_NAMES.get(raw)
+    if name is None:
+        name = _SEVERITY_NAMES[raw] = sys.intern((raw or "UNKNOWN").upper())
+    return name
+
+
+# Fields projected from each stored violation. The scan writer always sets all
+# of them, so a single C-level itemgetter call replaces six .get() calls.
+_VIOLATION_FIELDS = ("rule_id", "resource_type", "resource_id", "region", "message", "remediation")
+_project_violation = itemgetter(*_VIOLATION_FIELDS)
+
+
+# Report rows are slotted dataclasses rather than per-violation dicts; orjson
+# serialises them natively, field order preserved, so the JSON is unchanged.
+# ``get`` keeps them readable the same way as rows parsed back from the cache.
+class _Row:
+    __slots__ = ()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+@dataclass(slots=True)
+class _GroupedViolation(_Row):
+    """Entry under violations_by_resource_type (the type is the group key)."""
+    rule_id: str | None
+    severity: str | None
+    resource_id: str | None
+    region: str | None
+    message: str | None
+    recommendation: str | None
+
+
+@dataclass(slots=True)
+class _ReportViolation(_Row):
+    """Entry in all_violations."""
+    rule_id: str | None
+    severity: str | None
+    resource_type: str | None
+    resource_id: str | None
+    region: str | None
+    message: str | None
+    recommendation: str | None
+
+
+def _resolve_session(scan_id: str | None) -> tuple[str, dict]:
+    """Return (scan_id, session) for ``scan_id``, or the latest completed scan if None."""
     if scan_id:
         if scan_id not in store.scan_sessions:
             print(f"Error: Scan {scan_id} not found.", file=sys.stderr)
             sys.exit(1)
         session = store.scan_sessions[scan_id]
     else:
-        sessions = sorted(
-            store.scan_sessions.values(),
-            key=lambda s: s["started_at"],
-            reverse=True,
-        )
-        completed = [s for s in sessions if s["status"] == "completed"]
-        if not completed:
+        completed = (s for s in store.scan_sessions.values() if s["status"] == "completed")
+        session = max(completed, key=lambda s: s["started_at"], default=None)
+        if session is None:
             print("No completed scans found. Run a scan first.", file=sys.stderr)
             sys.exit(1)
-        session = completed[0]
         scan_id = session["id"]
+    return scan_id, session
+
+
+def build_report(scan_id: str | None = None, top_n: int | None = None) -> dict:
+    """
+    Build a structured JSON audit report.
+
+    With ``top_n`` only a summary report is built: ``all_violations`` holds
+    the ``top_n`` most severe violations (picked with a bounded heap rather
+    than a full sort) and ``violations_by_resource_type`` is omitted. Such
+    reports are never cached.
+    """
+    scan_id, session = _resolve_session(scan_id)
 
     resources = store.scan_resources.get(scan_id, [])
     violations = store.scan_violations.get(scan_id, [])
 
-    # Severity summary
-    sev_counts: dict[str, int] = {}
-    for v in violations:
-        sev = v.get("severity", "UNKNOWN").upper()
-        sev_counts[sev] = sev_counts.get(sev, 0) + 1
-
-    # Group violations by resource type
-    by_type: dict[str, list] = {}
-    for v in violations:
-        rtype = v.get("resource_type", "UNKNOWN")
-        by_type.setdefault(rtype, []).append({
-            "rule_id": v.get("rule_id"),
-            "severity": v.get("severity"),
-            "resource_id": v.get("resource_id"),
-            "region": v.get("region"),
-            "message": v.get("message"),
-            "recommendation": v.get("remediation"),
-        })
+    # Normalise each severity once; the summary, ranking and rows all share
+    # the interned name
+    severities = [_severity_name(v.get("severity")) for v in violations]
+    sev_counts = Counter(severities)
 
     # Resource counts
-    resource_counts: dict[str, int] = {}
-    for r in resources:
-        rtype = r.get("resource_type", "UNKNOWN")
-        resource_counts[rtype] = resource_counts.get(rtype, 0) + 1
+    resource_counts = Counter(r.get("resource_type", "UNKNOWN") for r in resources)
 
     report = {
         "report_meta": {
@@ -84,97 +142,155 @@ def build_report(scan_id: str | None = None) -> dict:
         "summary": {
             "total_resources": len(resources),
             "total_violations": len(violations),
-            "resources_by_type": resource_counts,
-            "violations_by_severity": sev_counts,
+            "resources_by_type": dict(resource_counts),
+            "violations_by_severity": dict(sev_counts),
         },
-        "violations_by_resource_type": by_type,
-        "all_violations": [
-            {
-                "rule_id": v.get("rule_id"),
-                "severity": v.get("severity"),
-                "resource_type": v.get("resource_type"),
-                "resource_id": v.get("resource_id"),
-                "region": v.get("region"),
-                "message": v.get("message"),
-                "recommendation": v.get("remediation"),
-            }
-            for v in sorted(
-                violations,
-                key=lambda x: {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}.get(
-                    (x.get("severity") or "LOW").upper(), 4
-                ),
-            )
-        ],
     }
+
+    if top_n is not None:
+        # nsmallest is stable, so ties keep store order exactly as the full sort does
+        top = heapq.nsmallest(top_n, zip(severities, violations), key=lambda sv: _SEV_RANK.get(sv[0], 4))
+        projected = []
+        for severity, v in top:
+            rule_id, *fields = map(v.get, _VIOLATION_FIELDS)
+            projected.append(_ReportViolation(rule_id, severity, *fields))
+        report["all_violations"] = projected
+        return report
+
+    # Per-type grouping and the flat projection in one pass. Appending into a
+    # defaultdict is a linear hash group-by with no sort, which is the right
+    # shape at scan sizes (thousands of violations). Vectorised grouping such
+    # as DataFrame.groupby only wins past roughly 100k rows, and the report
+    # would pay for building the frame and converting back to records.
+    by_type: dict[str, list] = defaultdict(list)
+    ranked: list[tuple[int, dict]] = []
+    for v, severity in zip(violations, severities):
+        try:
+            rule_id, rtype, resource_id, region, message, recommendation = _project_violation(v)
+            group = rtype
+        except KeyError:
+            # Violations loaded from older scans may lack some fields
+            rule_id, rtype, resource_id, region, message, recommendation = map(v.get, _VIOLATION_FIELDS)
+            group = v.get("resource_type", "UNKNOWN")
+
+        by_type[group].append(
+            _GroupedViolation(rule_id, severity, resource_id, region, message, recommendation)
+        )
+        ranked.append((
+            _SEV_RANK.get(severity, 4),
+            _ReportViolation(rule_id, severity, rtype, resource_id, region, message, recommendation),
+        ))
+    ranked.sort(key=itemgetter(0))
+
+    report["violations_by_resource_type"] = dict(by_type)
+    report["all_violations"] = [projected for _, projected in ranked]
     return report
 
 
 # ─── Slack ────────────────────────────────────────────────────────────────────
 
 _SEV_EMOJI = {"CRITICAL": "🔴", "HIGH": "🟠", "MEDIUM": "🟡", "LOW": "🔵"}
+_SLACK_SEVERITIES = ("CRITICAL", "HIGH", "MEDIUM", "LOW")
+# Violations listed in the Slack message; a summary report needs no more
+SLACK_TOP_VIOLATIONS = 5
+
 
+def _compile_slack_template() -> bytes:
+    """
+    Serialise the fixed-shape head of the Slack message once, at import.
+    ``{name}`` markers become ``%(name)s`` slots for ``bytes.__mod__``; the
+    ``"{tail}"`` string stands in for the variable trailing blocks.
+    """
+    skeleton = {
+        "blocks": [
+            {
+                "type": "header",
+                "text": {"type": "plain_text", "text": "☁️ AWS Cloud Audit Report", "emoji": True},
+            },
+            {
+                "type": "section",
+                "fields": [
+                    {"type": "mrkdwn", "text": "*Scan ID:*\n`{scan_id}…`"},
+                    {"type": "mrkdwn", "text": "*Regions:*\n{regions}"},
+                    {"type": "mrkdwn", "text": "*Total Resources:*\n{total_resources}"},
+                    {"type": "mrkdwn", "text": "*Total Violations:*\n{total_violations}"},
+                ],
+            },
+            {"type": "divider"},
+            {
+                "type": "section",
+                "text": {"type": "mrkdwn", "text": "*Violations by Severity*"},
+            },
+            {
+                "type": "section",
+                "fields": [
+                    {"type": "mrkdwn", "text": f"{_SEV_EMOJI.get(s, '⚪')} *{s}:* {{{s}}}"}
+                    for s in _SLACK_SEVERITIES
+                ],
+            },
+            "{tail}",
+        ],
+    }
+    template = orjson.dumps(skeleton).replace(b"%", b"%%").replace(b'"{tail}"', b"%(tail)s")
+    for name in ("scan_id", "regions", "total_resources", "total_violations", *_SLACK_SEVERITIES):
+        template = template.replace(b"{%s}" % name.encode(), b"%%(%s)s" % name.encode())
+    return template
 
-def _build_slack_payload(report: dict) -> dict:
-    """Convert an audit report dict into a Slack Block Kit message payload."""
+
+_SLACK_TEMPLATE = _compile_slack_template()
+
+# Static blocks that may follow the head. Shared across calls and only ever
+# serialised, never modified.
+_DIVIDER = {"type": "divider"}
+_TOP_VIOLATIONS_HEADING = {
+    "type": "section",
+    "text": {"type": "mrkdwn", "text": "*Top Violations (sorted by severity)*"},
+}
+
+
+def _json_text(value: Any) -> bytes:
+    """``value`` as the escaped contents of a JSON string, ready to drop into a template slot."""
+    return orjson.dumps(str(value))[1:-1]
+
+
+def _build_slack_payload(report: dict) -> bytes:
+    """Convert an audit report dict into a serialised Slack Block Kit message payload."""
     meta = report["report_meta"]
     summary = report["summary"]
     sev = summary.get("violations_by_severity", {})
 
     region_str = ", ".join(meta.get("regions", []))
-    blocks = [
-        {
-            "type": "header",
-            "text": {"type": "plain_text", "text": "☁️ AWS Cloud Audit Report", "emoji": True},
-        },
-        {
-            "type": "section",
-            "fields": [
-                {"type": "mrkdwn", "text": f"*Scan ID:*\n`{meta['scan_id'][:8]}…`"},
-                {"type": "mrkdwn", "text": f"*Regions:*\n{region_str or 'N/A'}"},
-                {"type": "mrkdwn", "text": f"*Total Resources:*\n{summary['total_resources']}"},
-                {"type": "mrkdwn", "text": f"*Total Violations:*\n{summary['total_violations']}"},
-            ],
-        },
-        {"type": "divider"},
-        {
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "*Violations by Severity*"},
-        },
-        {
-            "type": "section",
-            "fields": [
-                {"type": "mrkdwn", "text": f"{_SEV_EMOJI.get(s, '⚪')} *{s}:* {sev.get(s, 0)}"}
-                for s in ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
-            ],
-        },
-    ]
+    slots = {
+        b"scan_id": _json_text(meta["scan_id"][:8]),
+        b"regions": _json_text(region_str or "N/A"),
+        b"total_resources": _json_text(summary["total_resources"]),
+        b"total_violations": _json_text(summary["total_violations"]),
+    }
+    for s in _SLACK_SEVERITIES:
+        slots[s.encode()] = _json_text(sev.get(s, 0))
+
+    # Variable-length blocks after the fixed head
+    blocks = []
 
     # Top 5 worst violations
-    top_violations = report["all_violations"][:5]
+    top_violations = report["all_violations"][:SLACK_TOP_VIOLATIONS]
     if top_violations:
-        blocks.append({"type": "divider"})
-        blocks.append({
-            "type": "section",
-            "text": {"type": "mrkdwn", "text": "*Top Violations (sorted by severity)*"},
-        })
+        blocks.append(_DIVIDER)
+        blocks.append(_TOP_VIOLATIONS_HEADING)
         for v in top_violations:
-            emoji = _SEV_EMOJI.get((v.get("severity") or "").upper(), "⚪")
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": (
-                        f"{emoji} `{v.get('rule_id', 'N/A')}` — *{v.get('resource_type')}* "
-                        f"`{v.get('resource_id', '')}` [{v.get('region', '')}]\n"
-                        f"> {v.get('message', '')}"
-                    ),
-                },
-            })
+            emoji = _SEV_EMOJI.get(v.get("severity"), "⚪")
+            rule_id = v.get("rule_id", "N/A")
+            rtype = v.get("resource_type")
+            resource_id = v.get("resource_id", "")
+            region = v.get("region", "")
+            message = v.get("message", "")
+            text = f"{emoji} `{rule_id}` — *{rtype}* `{resource_id}` [{region}]\n> {message}"
+            blocks.append({"type": "section", "text": {"type": "mrkdwn", "text": text}})
 
     # Resources by type summary
     res_by_type = summary.get("resources_by_type", {})
     if res_by_type:
-        blocks.append({"type": "divider"})
+        blocks.append(_DIVIDER)
         breakdown = "  ".join(f"*{k}:* {v}" for k, v in sorted(res_by_type.items()))
         blocks.append({
             "type": "section",
@@ -190,35 +306,200 @@ def _build_slack_payload(report: dict) -> dict:
             }
         ],
     })
-    return {"blocks": blocks}
+    slots[b"tail"] = b",".join(map(orjson.dumps, blocks))
+    return _SLACK_TEMPLATE % slots
 
 
-def post_to_slack(report: dict, webhook_url: str) -> None:
-    """POST the audit summary to a Slack incoming webhook."""
-    import urllib.error
-    import urllib.request
+_SLACK_JSON_HEADERS = {"Content-Type": "application/json"}
+_SLACK_GZIP_HEADERS = {**_SLACK_JSON_HEADERS, "Content-Encoding": "gzip"}
+# Slack does not document compressed webhook bodies. Cleared after a gzip post
+# is rejected and plain JSON gets through, so later posts skip the attempt.
+_slack_accepts_gzip = True
+
+
+def _print_slack_result(resp) -> None:
+    if resp.status_code == 200:
+        print("✅ Slack notification sent successfully.")
+    elif resp.status_code >= 400:
+        print(f"❌ Slack webhook error {resp.status_code}: {resp.text}", file=sys.stderr)
+    else:
+        print(f"⚠️  Slack returned HTTP {resp.status_code}.", file=sys.stderr)
+
 
+async def post_to_slack_async(report: dict, webhook_url: str, client) -> None:
+    """
+    POST the audit summary to a Slack incoming webhook on an ``httpx.AsyncClient``.
+    The body is gzip-compressed; if the webhook answers 400 to that, the same
+    payload is resent as plain JSON.
+    """
+    global _slack_accepts_gzip
     payload = _build_slack_payload(report)
-    data = json.dumps(payload).encode("utf-8")
-    req = urllib.request.Request(
-        webhook_url,
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
     try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            if resp.getcode() == 200:
-                print("✅ Slack notification sent successfully.")
-            else:
-                print(f"⚠️  Slack returned HTTP {resp.getcode()}.", file=sys.stderr)
-    except urllib.error.HTTPError as exc:
-        body = exc.read().decode(errors="replace")
-        print(f"❌ Slack webhook error {exc.code}: {body}", file=sys.stderr)
+        if _slack_accepts_gzip:
+            # Level 1 gets most of the size reduction on repetitive JSON for little CPU
+            body = gzip.compress(payload, compresslevel=1)
+            resp = await client.post(webhook_url, content=body, headers=_SLACK_GZIP_HEADERS)
+            if resp.status_code == 400:
+                resp = await client.post(webhook_url, content=payload, headers=_SLACK_JSON_HEADERS)
+                if resp.status_code == 200:
+                    _slack_accepts_gzip = False
+        else:
+            resp = await client.post(webhook_url, content=payload, headers=_SLACK_JSON_HEADERS)
+        _print_slack_result(resp)
     except Exception as exc:
         print(f"❌ Failed to send Slack notification: {exc}", file=sys.stderr)
 
 
+def post_many_to_slack(reports: list[dict], webhook_url: str, transport=None) -> None:
+    """
+    POST one summary per report concurrently on one pooled client, so N posts
+    take roughly one round-trip rather than N. Failures are reported per post.
+    ``transport`` replaces the network layer (tests pass an ``httpx.MockTransport``).
+    """
+    import httpx
+
+    async def _post_all() -> None:
+        async with httpx.AsyncClient(
+            timeout=10,
+            # HTTP/2 needs the optional h2 package; without it httpx stays on HTTP/1.1
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=4),
+            transport=transport,
+        ) as client:
+            await asyncio.gather(*(post_to_slack_async(r, webhook_url, client) for r in reports))
+
+    asyncio.run(_post_all())
+
+
+def post_to_slack(report: dict, webhook_url: str) -> None:
+    """POST the audit summary to a Slack incoming webhook."""
+    post_many_to_slack([report], webhook_url)
+
+
+# ─── Output ───────────────────────────────────────────────────────────────────
+
+_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+# write_report issues one small write per violation; a larger file buffer
+# turns those into fewer, bigger syscalls than the 8 KiB default
+_WRITE_BUFFER_BYTES = 1 << 16
+
+
+def _is_open_container(value: Any) -> bool:
+    """Non-empty dict or list — empty ones are written as ``{}``/``[]`` by orjson."""
+    return isinstance(value, (dict, list)) and bool(value)
+
+
+def write_report(report: dict, out: BinaryIO, indent: int = 0, depth: int = 3) -> None:
+    """
+    Write ``report`` to the binary stream ``out`` as 2-space indented JSON,
+    identical to ``orjson.dumps(report, option=OPT_INDENT_2)``.
+
+    The top ``depth`` levels of dicts and lists are written piece by piece,
+    so only one violation is ever encoded at a time rather than the whole
+    report being held in memory as a second, serialised copy.
+    """
+    pad = b"  " * indent
+    if depth and _is_open_container(report):
+        is_dict = isinstance(report, dict)
+        out.write(b"{\n" if is_dict else b"[\n")
+        items = report.items() if is_dict else enumerate(report)
+        for i, (key, value) in enumerate(items):
+            if i:
+                out.write(b",\n")
+            out.write(pad + b"  ")
+            if is_dict:
+                out.write(orjson.dumps(str(key)) + b": ")
+            write_report(value, out, indent + 1, depth - 1)
+        out.write(b"\n" + pad + (b"}" if is_dict else b"]"))
+    else:
+        # orjson escapes newlines inside strings, so every raw newline is indentation
+        out.write(orjson.dumps(report, option=_DUMP_OPTIONS, default=str).replace(b"\n", b"\n" + pad))
+
+
+# ─── Report cache ─────────────────────────────────────────────────────────────
+
+# Private to the user running the report, next to the scan data it is built from
+_CACHE_DIR = store._DATA_DIR / ".report_cache"
+_CACHE_MAX_ENTRIES = 32
+# Bump whenever the report layout or contents change, so older cached files
+# are never served after an upgrade
+_REPORT_FORMAT_VERSION = 2
+
+
+def _cache_dir() -> Path | None:
+    """
+    The report cache directory, created 0700 on first use. Returns None (no
+    caching) unless it is a real directory owned by this user and closed to
+    everyone else, since cached files are emitted and posted verbatim.
+    """
+    try:
+        _CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = _CACHE_DIR.lstat()
+    except OSError as exc:
+        print(f"⚠️  Report cache unavailable: {exc}", file=sys.stderr)
+        return None
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        print(f"⚠️  Ignoring report cache {_CACHE_DIR}: not a private directory", file=sys.stderr)
+        return None
+    return _CACHE_DIR
+
+
+def _report_cache_path(scan_id: str, session: dict) -> Path | None:
+    """
+    Cache file for a scan's serialised report, or None when caching is off.
+    The key covers the report format version, the scan's completion time and
+    the full violation list, so stale entries are simply never read.
+    """
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{_REPORT_FORMAT_VERSION}:{scan_id}:{session.get('completed_at')}:".encode())
+    digest.update(orjson.dumps(store.scan_violations.get(scan_id, []), default=str))
+    return cache_dir / f"audit_report_{digest.hexdigest()}.json"
+
+
+def _prune_cache(keep: Path) -> None:
+    """Delete all but the newest ``_CACHE_MAX_ENTRIES`` cached reports (never ``keep``)."""
+    entries = []
+    for path in _CACHE_DIR.glob("audit_report_*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    entries.sort(reverse=True)
+    for _, path in entries[_CACHE_MAX_ENTRIES:]:
+        if path != keep:
+            try:
+                path.unlink()
+            except OSError:
+                continue
+
+
+def _store_cached_report(report: dict, cache_path: Path) -> bool:
+    """Write ``report`` to the cache atomically. Returns False if the cache is not writable."""
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb", buffering=_WRITE_BUFFER_BYTES) as fh:
+            write_report(report, fh)
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        print(f"⚠️  Could not cache report: {exc}", file=sys.stderr)
+        tmp_path.unlink(missing_ok=True)
+        return False
+    _prune_cache(keep=cache_path)
+    return True
+
+
+def _emit_report(report: dict | None, cache_path: Path | None, out: BinaryIO) -> None:
+    """Copy the cached report to ``out`` when there is one, otherwise serialise ``report``."""
+    if cache_path is not None:
+        with cache_path.open("rb") as cached:
+            shutil.copyfileobj(cached, out)
+    else:
+        write_report(report, out)
+
+
 # ─── CLI entry-point ──────────────────────────────────────────────────────────
 
 def main():
@@ -236,20 +517,38 @@ def main():
             "otherwise reads SLACK_WEBHOOK_URL from environment."
         ),
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rebuild the report even if a cached copy for this scan exists",
+    )
     args = parser.parse_args()
 
-    report = build_report(args.scan_id)
-    output = json.dumps(report, indent=2, default=str)
+    scan_id, session = _resolve_session(args.scan_id)
+    cache_path = None if args.no_cache else _report_cache_path(scan_id, session)
+
+    report = None
+    if cache_path is None or not cache_path.exists():
+        report = build_report(scan_id)
+        if cache_path is not None and not _store_cached_report(report, cache_path):
+            cache_path = None
+    if report is None and (args.output or args.slack is not None):
+        # Cache hit: the file comes from the cache, and the summary lines and
+        # Slack message only need the summary plus the top violations
+        report = build_report(scan_id, top_n=SLACK_TOP_VIOLATIONS)
 
     if args.output:
-        Path(args.output).write_text(output, encoding="utf-8")
+        with open(args.output, "wb", buffering=_WRITE_BUFFER_BYTES) as fh:
+            _emit_report(report, cache_path, fh)
         print(f"Report written to {args.output}")
         print(f"  Total resources : {report['summary']['total_resources']}")
         print(f"  Total violations: {report['summary']['total_violations']}")
         for sev, count in sorted(report["summary"]["violations_by_severity"].items()):
             print(f"    {sev}: {count}")
     else:
-        print(output)
+        _emit_report(report, cache_path, sys.stdout.buffer)
+        sys.stdout.buffer.write(b"\n")
+        sys.stdout.flush()
 
     # Slack notification (optional)
     if args.slack is not None:
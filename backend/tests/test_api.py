@@ -13,10 +13,16 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture(scope="session")
+async def client():
+    """One client and transport shared by every test in the session."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+
 @pytest.mark.anyio
-async def test_health_endpoint():
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.get("/health")
+async def test_health_endpoint(client):
+    response = await client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert "status" in data
@@ -25,9 +31,8 @@ async def test_health_endpoint():
 
 
 @pytest.mark.anyio
-async def test_version_endpoint():
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.get("/api/v1/version")
+async def test_version_endpoint(client):
+    response = await client.get("/api/v1/version")
     assert response.status_code == 200
     data = response.json()
     assert "version" in data
@@ -35,10 +40,9 @@ async def test_version_endpoint():
 
 
 @pytest.mark.anyio
-async def test_list_scans_returns_dict_with_scans_key():
+async def test_list_scans_returns_dict_with_scans_key(client):
     """GET /api/v1/scans returns {"scans": [...], "total": N}"""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.get("/api/v1/scans")
+    response = await client.get("/api/v1/scans")
     assert response.status_code == 200
     data = response.json()
     assert "scans" in data
@@ -47,13 +51,12 @@ async def test_list_scans_returns_dict_with_scans_key():
 
 
 @pytest.mark.anyio
-async def test_trigger_scan_and_check_status():
+async def test_trigger_scan_and_check_status(client):
     """POST /api/v1/scans returns 202 with scan_id; GET returns session."""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        post_resp = await client.post(
-            "/api/v1/scans",
-            json={"regions": ["us-east-1"], "resource_types": ["EC2"]},
-        )
+    post_resp = await client.post(
+        "/api/v1/scans",
+        json={"regions": ["us-east-1"], "resource_types": ["EC2"]},
+    )
     assert post_resp.status_code == 202
     data = post_resp.json()
     assert "scan_id" in data
@@ -61,8 +64,7 @@ async def test_trigger_scan_and_check_status():
 
 
 @pytest.mark.anyio
-async def test_scan_not_found_returns_404():
+async def test_scan_not_found_returns_404(client):
     """GET /api/v1/scans/<invalid-id> returns 404."""
-    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
-        response = await client.get("/api/v1/scans/nonexistent-scan-id")
+    response = await client.get("/api/v1/scans/nonexistent-scan-id")
     assert response.status_code == 404
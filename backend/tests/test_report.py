@@ -0,0 +1,80 @@
+"""Tests for the CLI report generator (scripts/report.py)."""
+import asyncio
+import gzip
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import httpx
+import orjson
+
+os.environ["MOCK_AWS"] = "true"
+
+_spec = importlib.util.spec_from_file_location(
+    "report", Path(__file__).parent.parent / "scripts" / "report.py"
+)
+report_cli = importlib.util.module_from_spec(_spec)
+# dataclasses look the module up while the script is being executed
+sys.modules["report"] = report_cli
+_spec.loader.exec_module(report_cli)
+
+
+def _report(scan_id):
+    return {
+        "report_meta": {"scan_id": scan_id, "regions": ["us-east-1"], "completed_at": "2030-01-01"},
+        "summary": {
+            "total_resources": 1,
+            "total_violations": 1,
+            "resources_by_type": {"EC2": 1},
+            "violations_by_severity": {"HIGH": 1},
+        },
+        "all_violations": [{
+            "rule_id": "EC2-002", "severity": "HIGH", "resource_type": "EC2",
+            "resource_id": "i-1", "region": "us-east-1", "message": "idle",
+        }],
+    }
+
+
+def test_slack_posts_fan_out_concurrently(monkeypatch):
+    monkeypatch.setattr(report_cli, "_slack_accepts_gzip", True)
+    n = 5
+    in_flight = 0
+    peak = 0
+    scan_ids = []
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        assert request.headers["Content-Encoding"] == "gzip"
+        blocks = orjson.loads(gzip.decompress(request.content))["blocks"]
+        scan_ids.append(blocks[1]["fields"][0]["text"])
+        return httpx.Response(200, text="ok")
+
+    reports = [_report(f"scan{i:04d}") for i in range(n)]
+    report_cli.post_many_to_slack(reports, "https://hooks.example/x", httpx.MockTransport(handler))
+
+    assert peak == n
+    assert sorted(scan_ids) == [f"*Scan ID:*\n`scan{i:04d}…`" for i in range(n)]
+
+
+def test_slack_falls_back_to_plain_json_when_gzip_is_rejected(monkeypatch):
+    monkeypatch.setattr(report_cli, "_slack_accepts_gzip", True)
+    received = []
+
+    def handler(request):
+        if request.headers.get("Content-Encoding") == "gzip":
+            received.append("gzip")
+            return httpx.Response(400, text="invalid_payload")
+        received.append(orjson.loads(request.content)["blocks"][0]["type"])
+        return httpx.Response(200, text="ok")
+
+    transport = httpx.MockTransport(handler)
+    report_cli.post_many_to_slack([_report("scan0001")], "https://hooks.example/x", transport)
+    assert received == ["gzip", "header"]
+
+    report_cli.post_many_to_slack([_report("scan0002")], "https://hooks.example/x", transport)
+    assert received == ["gzip", "header", "header"]